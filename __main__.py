@@ -10,7 +10,7 @@ __copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
 __credits__ = 'Benjamin P. Trachtenberg'
 __license__ = ''
 __status__ = 'prod'
-__version_info__ = (1, 0, 12, __status__)
+__version_info__ = (1, 0, 22, __status__)
 __version__ = '.'.join(map(str, __version_info__))
 __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
@@ -55,6 +55,37 @@ if __name__ == '__main__':
     arg_parser_pl.add_argument('filename_a', help='The "A" Side file name you saved the Prefix-List to')
     arg_parser_pl.add_argument('filename_b', help='The "B" Side file name you saved the Prefix-List to')
     arg_parser_pl.add_argument('output_filename', help='The name of the file you want to send output to')
+    arg_parser_pl.add_argument('-s', '--semantic', help='Diff the routes the Prefix-Lists permit, instead of the text '
+                                                        'of the entries', action='store_true')
+    arg_parser_pl.add_argument('-c', '--config', help='The files are full show runs, diff every Prefix-List with the '
+                                                      'same name', action='store_true')
+
+    arg_parser_pl_check = subparsers.add_parser('plcheck', help='Check a Prefix-List is the same on many devices')
+    arg_parser_pl_check.set_defaults(which_sub='plcheck')
+    arg_parser_pl_check.add_argument('filename_a', help='A folder, or glob of files with the Prefix-List, or show runs')
+    arg_parser_pl_check.add_argument('output_filename', help='The name of the file you want to send output to')
+    arg_parser_pl_check.add_argument('-n', '--name', help='The name of the Prefix-List to pull out of full show runs')
+
+    arg_parser_pl_eval = subparsers.add_parser('pleval', help='Run the routes of a show ip bgp, or show route through '
+                                                              'a Prefix-List')
+    arg_parser_pl_eval.set_defaults(which_sub='pleval')
+    arg_parser_pl_eval.add_argument('filename_a', help='The file name you saved the Prefix-List to')
+    arg_parser_pl_eval.add_argument('filename_b', help='The file name you saved the show ip bgp, or show route to')
+    arg_parser_pl_eval.add_argument('output_filename', help='The name of the file you want to send output to')
+    arg_parser_pl_eval.add_argument('-s', '--summary', help='Only output the number of routes for each entry',
+                                    action='store_true')
+
+    arg_parser_pl_audit = subparsers.add_parser('plaudit', help='Find the shadowed, and redundant entries of a '
+                                                                'Prefix-List')
+    arg_parser_pl_audit.set_defaults(which_sub='plaudit')
+    arg_parser_pl_audit.add_argument('filename_a', help='The file name you saved the Prefix-List to')
+    arg_parser_pl_audit.add_argument('output_filename', help='The name of the file you want to send output to')
+
+    arg_parser_pl_minimize = subparsers.add_parser('plminimize', help='Make a Prefix-List with fewer entries that '
+                                                                      'matches every route the same')
+    arg_parser_pl_minimize.set_defaults(which_sub='plminimize')
+    arg_parser_pl_minimize.add_argument('filename_a', help='The file name you saved the Prefix-List to')
+    arg_parser_pl_minimize.add_argument('output_filename', help='The name of the file you want to send output to')
 
     arg_parser_acl = subparsers.add_parser('acldiff', help='ACL Differ')
     arg_parser_acl.set_defaults(which_sub='acldiff')
@@ -89,6 +120,49 @@ if __name__ == '__main__':
     arg_parser_config_split.add_argument('filename_a', help='The file name of the show run')
     arg_parser_config_split.add_argument('-t', '--text', help='Output text files, default is to output to Excel',
                                          action='store_true')
+    arg_parser_config_split.add_argument('-s', '--stream', help='Read the show run one line at a time, and output '
+                                                                'each section as it is found, for very large configs',
+                                         action='store_true')
+    arg_parser_config_split.add_argument('-b', '--batch', help='filename_a is a folder, or glob of show runs to split '
+                                                               'in parallel', action='store_true')
+    arg_parser_config_split.add_argument('-w', '--workers', help='Number of worker processes for batch, default is '
+                                                                 'the number of CPUs', type=int)
+    arg_parser_config_split.add_argument('-n', '--no_cache', help='Do not use the parse cache', action='store_true')
+    arg_parser_config_split.add_argument('-c', '--clear_cache', help='Clear the parse cache before splitting',
+                                         action='store_true')
+    arg_parser_config_split.add_argument('-i', '--incremental', help='Only rewrite the output that changed since the '
+                                                                     'previous split of the host', action='store_true')
+    arg_parser_config_split.add_argument('-m', '--mmap', help='Memory map the show run, and keep sections as offsets '
+                                                              'into the file instead of copies of the lines',
+                                         action='store_true')
+    arg_parser_config_split.add_argument('--sections', help='Comma separated list of sections to parse, and output, '
+                                                            'example prefix_lists,route_maps, default is all sections')
+    arg_parser_config_split.add_argument('-p', '--platform', help='The platform of the show run, default is to detect '
+                                                                  'it from the head of the file, all uses every parser',
+                                         choices=('auto', 'all', 'ios', 'nxos', 'iosxr'), default='auto')
+    arg_parser_config_split.add_argument('--parse_workers', help='Cut one large show run at ! lines, and parse the '
+                                                                 'pieces on this many processes', type=int)
+
+    arg_parser_config_index = subparsers.add_parser('index', help='Index the sections of many configs, and look them '
+                                                                  'up')
+    arg_parser_config_index.set_defaults(which_sub='index')
+    arg_parser_config_index.add_argument('filename_a', nargs='?', help='A folder, or glob of show runs to add to '
+                                                                       'the index')
+    arg_parser_config_index.add_argument('-d', '--database', help='The index database, default is Data/{name}'.format(
+        name=mod.scripts.config_index.INDEX_FILE_NAME))
+    arg_parser_config_index.add_argument('-w', '--workers', help='Number of worker processes, default is the number '
+                                                                 'of CPUs', type=int)
+    arg_parser_config_index.add_argument('-p', '--platform', help='The platform of the show runs, default is to '
+                                                                  'detect it', choices=('auto', 'all', 'ios', 'nxos',
+                                                                                        'iosxr'), default='auto')
+    arg_parser_config_index.add_argument('-s', '--section', help='Find sections by name, %% is a wildcard')
+    arg_parser_config_index.add_argument('-r', '--references', help='Find the sections that reference a name, %% is a '
+                                                                    'wildcard')
+    arg_parser_config_index.add_argument('-l', '--lines', help='Find the section lines that match, %% is a wildcard')
+    arg_parser_config_index.add_argument('-k', '--kind', help='Only look up this section kind, example prefix_lists')
+    arg_parser_config_index.add_argument('--hostname', help='Only look up this hostname, %% is a wildcard')
+    arg_parser_config_index.add_argument('-o', '--output_lines', help='Print the lines of the sections found',
+                                         action='store_true')
 
     arg_parser_convert_mcast_acl = subparsers.add_parser('convertmcastacltorm',
                                                          help='Convert Mcast ACL to Route-Map from a show '
@@ -116,8 +190,8 @@ if __name__ == '__main__':
 
     try:
 
-        check_subs_two_files = ('pldiff', 'acldiff', 'filediff')
-        check_subs_one_file = ('acltopl', 'configsplit', 'convertmcastacltorm', 'aggregate')
+        check_subs_two_files = ('pldiff', 'pleval', 'acldiff', 'filediff')
+        check_subs_one_file = ('plaudit', 'plminimize', 'acltopl', 'configsplit', 'convertmcastacltorm', 'aggregate')
 
         if args.which_sub in check_subs_two_files:
             if args.filename_a not in existing_input_files or args.filename_b not in existing_input_files:
@@ -130,7 +204,7 @@ if __name__ == '__main__':
                     print(file_name)
                 sys.exit('Please check the names of your input files.  One, or both do not exist!')
 
-        elif args.which_sub in check_subs_one_file:
+        elif args.which_sub in check_subs_one_file and not getattr(args, 'batch', False):
             if args.filename_a not in existing_input_files:
                 LOGGER.error('Entered bad file name {filename_a} {existing}'.format(filename_a=args.filename_a,
                                                                                     existing=existing_input_files))
@@ -144,8 +218,31 @@ if __name__ == '__main__':
             OUTPUT_DIR = os.path.join(OUTPUT_DIR, args.folder)
 
         if args.which_sub == 'pldiff':
-            mod.scripts.pl_diff.prefix_list_diff(args.filename_a, args.filename_b, args.output_filename, INPUT_DIR,
-                                                 OUTPUT_DIR)
+            if args.config:
+                mod.scripts.pl_diff.prefix_list_config_diff(args.filename_a, args.filename_b, args.output_filename,
+                                                            INPUT_DIR, OUTPUT_DIR, args.semantic)
+
+            elif args.semantic:
+                mod.scripts.pl_diff.prefix_list_semantic_diff(args.filename_a, args.filename_b, args.output_filename,
+                                                              INPUT_DIR, OUTPUT_DIR)
+
+            else:
+                mod.scripts.pl_diff.prefix_list_diff(args.filename_a, args.filename_b, args.output_filename,
+                                                     INPUT_DIR, OUTPUT_DIR)
+
+        elif args.which_sub == 'plcheck':
+            mod.scripts.pl_diff.prefix_list_fleet_check(args.filename_a, args.output_filename, INPUT_DIR, OUTPUT_DIR,
+                                                        args.name)
+
+        elif args.which_sub == 'pleval':
+            mod.scripts.pl_diff.prefix_list_route_eval(args.filename_a, args.filename_b, args.output_filename,
+                                                       INPUT_DIR, OUTPUT_DIR, args.summary)
+
+        elif args.which_sub == 'plaudit':
+            mod.scripts.pl_diff.prefix_list_audit(args.filename_a, args.output_filename, INPUT_DIR, OUTPUT_DIR)
+
+        elif args.which_sub == 'plminimize':
+            mod.scripts.pl_diff.prefix_list_minimize(args.filename_a, args.output_filename, INPUT_DIR, OUTPUT_DIR)
 
         elif args.which_sub == 'acltopl':
             mod.scripts.acl_diff.acl_to_prefix_list_converter(args.filename_a, args.output_filename, INPUT_DIR,
@@ -176,7 +273,62 @@ if __name__ == '__main__':
                                             os.path.join(INPUT_DIR, args.folder_b), OUTPUT_DIR, args.oneoff, DATA_DIR)
 
         elif args.which_sub == 'configsplit':
-            mod.scripts.ConfigSplitter(args.filename_a, INPUT_DIR, OUTPUT_DIR, args.text)
+            cache_dir = os.path.join(DATA_DIR, 'Cache')
+            if args.clear_cache:
+                mod.scripts.ParseCache(cache_dir).clear()
+
+            if args.no_cache:
+                cache_dir = None
+
+            sections = None
+            if args.sections:
+                sections = [section.strip() for section in args.sections.split(',') if section.strip()]
+
+            if args.batch:
+                mod.scripts.config_split_batch(args.filename_a, INPUT_DIR, OUTPUT_DIR, args.text, args.stream,
+                                               args.workers, cache_dir, args.incremental, args.mmap, sections,
+                                               args.platform)
+
+            else:
+                splitter = mod.scripts.ConfigSplitter(args.filename_a, INPUT_DIR, OUTPUT_DIR, args.text, args.stream,
+                                                      cache_dir, args.incremental, args.mmap, sections, args.platform,
+                                                      parse_workers=args.parse_workers)
+                dropped_sections = mod.scripts.config_spliter.get_dropped_sections(sections, splitter.section_rules)
+                if dropped_sections:
+                    print('Sections {sections} are not split for the {platform} platform, use --platform to choose '
+                          'another platform'.format(sections=', '.join(dropped_sections),
+                                                    platform=splitter.platform))
+
+        elif args.which_sub == 'index':
+            database_path = args.database or os.path.join(DATA_DIR, mod.scripts.config_index.INDEX_FILE_NAME)
+            if args.filename_a:
+                mod.scripts.config_index_build(args.filename_a, INPUT_DIR, database_path, args.workers,
+                                               args.platform)
+
+            config_index = mod.scripts.ConfigIndex(database_path)
+            if args.section:
+                for hostname, kind, name, line_count, file_path in config_index.find_sections(args.section,
+                                                                                              args.kind,
+                                                                                              args.hostname):
+                    print('{hostname} {kind} {name} {line_count} lines'.format(hostname=hostname, kind=kind,
+                                                                               name=name, line_count=line_count))
+                    if args.output_lines:
+                        for line in config_index.get_section_lines(hostname, kind, name, file_path):
+                            print('    {line}'.format(line=line))
+
+            if args.references:
+                for hostname, kind, name, ref_kind, ref_name in config_index.find_references(args.references,
+                                                                                             hostname=args.hostname):
+                    if args.kind in (None, kind, ref_kind):
+                        print('{hostname} {kind} {name} references {ref_kind} {ref_name}'.format(
+                            hostname=hostname, kind=kind, name=name, ref_kind=ref_kind, ref_name=ref_name))
+
+            if args.lines:
+                for hostname, kind, name, line in config_index.search_lines(args.lines, args.kind, args.hostname):
+                    print('{hostname} {kind} {name}: {line}'.format(hostname=hostname, kind=kind, name=name,
+                                                                   line=line))
+
+            config_index.close()
 
         elif args.which_sub == 'convertmcastacltorm':
             if ipv4.ucast_ip(args.rp_address, return_tuple=False):
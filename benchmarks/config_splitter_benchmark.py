@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ConfigSplitter, builds synthetic IOS, NX-OS, and IOS-XR show runs, splits them, and writes
+the time of each stage, lines per second, and peak memory to a JSON file.
+
+Example:
+    python benchmarks/config_splitter_benchmark.py --sizes 10000,100000 --results results.json
+"""
+import json
+import os
+import platform as python_platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from multiprocessing import Pool
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import module as mod
+from module.scripts import config_spliter
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 0, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+PLATFORMS = ('ios', 'nxos', 'iosxr')
+MODES = ('memory', 'mmap', 'stream')
+OUTPUTS = ('text', 'xlsx')
+
+
+def ip_address(number):
+    """
+    Function to make a unique IPv4 address in 10.0.0.0/8 from a number
+    :param number: The round number, only the low 24 bits are used
+    :return:
+        A string example 10.0.1.2
+
+    """
+    return '10.{a}.{b}.{c}'.format(a=(number >> 16) & 255, b=(number >> 8) & 255, c=number & 255)
+
+
+def ios_blocks(number):
+    """
+    Function to make one round of IOS config blocks
+    :param number: The round number, used to make unique names
+    :return:
+        A list of lines
+
+    """
+    lines = ['interface GigabitEthernet0/{number}'.format(number=number),
+             ' description synthetic link {number}'.format(number=number),
+             ' ip address {ip} 255.255.255.252'.format(ip=ip_address(number * 4)),
+             ' ip access-group EXT-{number} in'.format(number=number),
+             ' no shutdown',
+             '!',
+             'ip access-list standard STD-{number}'.format(number=number)]
+    lines.extend(' permit {ip} 0.0.0.255'.format(ip=ip_address(number * 256 + entry)) for entry in range(5))
+    lines.append(' deny   any')
+    lines.append('ip access-list extended EXT-{number}'.format(number=number))
+    lines.extend(' permit tcp any host {ip} eq 22'.format(ip=ip_address(number + entry)) for entry in range(6))
+    lines.append(' deny   ip any any log')
+    lines.append('!')
+    lines.extend('ip prefix-list PL-{number} seq {seq} permit {ip}/24 le 32'.format(
+        number=number, seq=(entry + 1) * 5, ip=ip_address((number * 20 + entry) * 256)) for entry in range(20))
+    lines.append('!')
+    lines.append('ip community-list standard CL-{number} permit 65000:{number}'.format(number=number))
+    lines.append('!')
+    for seq in (10, 20, 30):
+        lines.extend(['route-map RM-{number} permit {seq}'.format(number=number, seq=seq),
+                      ' description synthetic {seq}'.format(seq=seq),
+                      ' match ip address prefix-list PL-{number}'.format(number=number),
+                      ' set local-preference {seq}'.format(seq=seq * 10),
+                      '!'])
+
+    lines.extend(['router bgp 65000',
+                  ' neighbor {ip} remote-as 65001'.format(ip=ip_address(number)),
+                  ' neighbor {ip} route-map RM-{number} in'.format(ip=ip_address(number), number=number),
+                  '!'])
+    return lines
+
+
+def nxos_blocks(number):
+    """
+    Function to make one round of NX-OS config blocks
+    :param number: The round number, used to make unique names
+    :return:
+        A list of lines
+
+    """
+    lines = ['interface Ethernet1/{number}'.format(number=number),
+             '  description synthetic link {number}'.format(number=number),
+             '  ip address {ip}/30'.format(ip=ip_address(number * 4)),
+             '  no shutdown',
+             '',
+             'ip access-list ACL-{number}'.format(number=number)]
+    lines.extend('  {seq} permit tcp any {ip}/32 eq 22'.format(seq=(entry + 1) * 10, ip=ip_address(number + entry))
+                 for entry in range(10))
+    lines.append('  110 deny ip any any')
+    lines.extend('ip prefix-list PL-{number} seq {seq} permit {ip}/24 le 32'.format(
+        number=number, seq=(entry + 1) * 5, ip=ip_address((number * 20 + entry) * 256)) for entry in range(20))
+    lines.append('ip community-list standard CL-{number} seq 10 permit 65000:{number}'.format(number=number))
+    for seq in (10, 20, 30):
+        lines.extend(['route-map RM-{number} permit {seq}'.format(number=number, seq=seq),
+                      '  description synthetic {seq}'.format(seq=seq),
+                      '  match ip address prefix-list PL-{number}'.format(number=number),
+                      '  set local-preference {seq}'.format(seq=seq * 10)])
+
+    lines.extend(['router bgp 65000',
+                  '  neighbor {ip}'.format(ip=ip_address(number)),
+                  '    remote-as 65001',
+                  '    address-family ipv4 unicast',
+                  '      route-map RM-{number} in'.format(number=number),
+                  '!'])
+    return lines
+
+
+def iosxr_blocks(number):
+    """
+    Function to make one round of IOS-XR config blocks
+    :param number: The round number, used to make unique names
+    :return:
+        A list of lines
+
+    """
+    lines = ['interface TenGigE0/0/0/{number}'.format(number=number),
+             ' description synthetic link {number}'.format(number=number),
+             ' ipv4 address {ip} 255.255.255.252'.format(ip=ip_address(number * 4)),
+             '!',
+             'ipv4 access-list ACL-{number}'.format(number=number),
+             ' 10 remark synthetic']
+    lines.extend(' {seq} permit tcp any host {ip} eq 22'.format(seq=(entry + 2) * 10, ip=ip_address(number + entry))
+                 for entry in range(10))
+    lines.append(' 200 deny ipv4 any any')
+    lines.append('!')
+    lines.append('prefix-set PS-{number}'.format(number=number))
+    lines.extend('  {ip}/24 le 32,'.format(ip=ip_address((number * 20 + entry) * 256)) for entry in range(19))
+    lines.append('  {ip}/24 le 32'.format(ip=ip_address((number * 20 + 19) * 256)))
+    lines.extend(['end-set', '!',
+                  'community-set CS-{number}'.format(number=number),
+                  '  65000:{number}'.format(number=number),
+                  'end-set', '!',
+                  'route-policy RP-{number}'.format(number=number),
+                  '  if destination in PS-{number} then'.format(number=number),
+                  '    set local-preference 200',
+                  '  else',
+                  '    drop',
+                  '  endif',
+                  'end-policy', '!',
+                  'router bgp 65000',
+                  ' neighbor {ip}'.format(ip=ip_address(number)),
+                  '  remote-as 65001',
+                  '  address-family ipv4 unicast',
+                  '   route-policy RP-{number} in'.format(number=number),
+                  '  !',
+                  ' !',
+                  '!'])
+    return lines
+
+
+PLATFORM_GENERATORS = {
+    'ios': (['!', 'version 15.2', 'service timestamps debug datetime msec', 'hostname BENCH-IOS', '!'],
+            ios_blocks, ['end']),
+    'nxos': (['!Command: show running-config', 'version 7.0(3)I7(6)', 'hostname BENCH-NXOS', 'feature bgp', ''],
+             nxos_blocks, []),
+    'iosxr': (['!! IOS XR Configuration 6.1.4', 'hostname BENCH-IOSXR', '!'], iosxr_blocks, ['end']),
+}
+
+
+def write_synthetic_config(platform, line_count, file_path):
+    """
+    Function to write a synthetic show run
+    :param platform: ios, nxos, or iosxr
+    :param line_count: The number of lines to write, the last round of blocks is not cut short
+    :param file_path: The file to write
+    :return:
+        The number of lines written
+
+    """
+    head, block_generator, tail = PLATFORM_GENERATORS[platform]
+    written = 0
+    with open(file_path, 'w') as config_file:
+        for line in head:
+            config_file.write(line + '\n')
+        written += len(head)
+        number = 0
+        while written < line_count - len(tail):
+            lines = block_generator(number)
+            config_file.write('\n'.join(lines) + '\n')
+            written += len(lines)
+            number += 1
+
+        for line in tail:
+            config_file.write(line + '\n')
+        written += len(tail)
+
+    return written
+
+
+def get_peak_rss_kb():
+    """
+    Function to get the peak resident memory of the process
+    :return:
+        Kilobytes, or None when the resource module is not available
+
+    """
+    try:
+        import resource
+
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024
+
+    return peak
+
+
+def run_case(case):
+    """
+    Function to split one synthetic config, run in a new worker process so the peak memory is for this case only
+    :param case: A tuple of platform, line count, mode, output, config directory, and trace memory
+    :return:
+        A list of result dictionaries, one for each stage, and one for the total
+
+    """
+    platform, line_count, mode, output, config_dir, trace_memory = case
+    file_name = '{platform}-{line_count}.txt'.format(platform=platform, line_count=line_count)
+    output_dir = tempfile.mkdtemp(prefix='bench-output-')
+    if trace_memory:
+        tracemalloc.start()
+
+    start_rss = get_peak_rss_kb()
+    start_time = time.perf_counter()
+    try:
+        splitter = mod.scripts.ConfigSplitter(file_name, config_dir, output_dir, output == 'text',
+                                              stream=mode == 'stream', mmap_storage=mode == 'mmap',
+                                              platform=platform)
+        total_time = time.perf_counter() - start_time
+        traced_peak = tracemalloc.get_traced_memory()[1] // 1024 if trace_memory else None
+
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    stage_times = list(splitter.stage_times.items()) + [('total', total_time)]
+    results = list()
+    for stage, seconds in stage_times:
+        results.append({'platform': platform,
+                        'lines': splitter.line_count,
+                        'mode': mode,
+                        'output': output,
+                        'stage': stage,
+                        'seconds': round(seconds, 6),
+                        'lines_per_sec': round(splitter.line_count / seconds) if seconds else None,
+                        'sections': splitter.section_count,
+                        'start_rss_kb': start_rss,
+                        'peak_rss_kb': get_peak_rss_kb(),
+                        'traced_peak_kb': traced_peak})
+
+    return results
+
+
+def main():
+    arg_parser = ArgumentParser(description='ConfigSplitter Benchmark')
+    arg_parser.add_argument('-s', '--sizes', help='Comma separated line counts',
+                            default=','.join(str(size) for size in DEFAULT_SIZES))
+    arg_parser.add_argument('-p', '--platforms', help='Comma separated platforms', default=','.join(PLATFORMS))
+    arg_parser.add_argument('-m', '--modes', help='Comma separated storage modes', default=','.join(MODES))
+    arg_parser.add_argument('-o', '--outputs', help='Comma separated outputs', default=','.join(OUTPUTS))
+    arg_parser.add_argument('-t', '--tracemalloc', help='Also trace the peak Python memory, this is slower',
+                            action='store_true')
+    arg_parser.add_argument('-r', '--results', help='The JSON results file', default='config_splitter_benchmark.json')
+    args = arg_parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    platforms = args.platforms.split(',')
+    modes = args.modes.split(',')
+    outputs = args.outputs.split(',')
+    config_dir = tempfile.mkdtemp(prefix='bench-configs-')
+    all_results = list()
+    try:
+        for platform in platforms:
+            for size in sizes:
+                file_path = os.path.join(config_dir, '{platform}-{size}.txt'.format(platform=platform, size=size))
+                write_synthetic_config(platform, size, file_path)
+
+        for platform in platforms:
+            for size in sizes:
+                for mode in modes:
+                    for output in outputs:
+                        with Pool(1, maxtasksperchild=1) as pool:
+                            results = pool.apply(run_case, ((platform, size, mode, output, config_dir,
+                                                             args.tracemalloc),))
+                        all_results.extend(results)
+                        total = results[-1]
+                        print('{platform:6} {lines:>8} {mode:6} {output:4} {seconds:8.3f}s {lines_per_sec:>10} '
+                              'lines/sec peak {peak_rss_kb} KB'.format(**total))
+
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    with open(args.results, 'w') as results_file:
+        json.dump({'benchmark_version': __version__,
+                   'config_splitter_version': config_spliter.__version__,
+                   'python': python_platform.python_version(),
+                   'results': all_results}, results_file, indent=1)
+
+    print('Results written to {results}'.format(results=args.results))
+
+
+if __name__ == '__main__':
+    main()
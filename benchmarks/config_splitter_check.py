@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Check for the ConfigSplitter, splits small fixture show runs of each platform, and checks the sections, and the
+text files written for them.
+
+Example:
+    python benchmarks/config_splitter_check.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import module as mod
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 0, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+IOS_OBJECT_GROUPS = ['version 15.2',
+                     'hostname IOS-CHECK',
+                     'object-group network SERVERS',
+                     ' host 10.0.0.1',
+                     ' 10.1.0.0 255.255.0.0',
+                     '!',
+                     'object-group service WEB',
+                     ' tcp eq www',
+                     '!']
+
+NXOS_OBJECT_GROUPS = ['!Command: show running-config',
+                      'version 9.3(5)',
+                      'hostname NXOS-CHECK',
+                      'object-group ip address SERVERS',
+                      '  10 host 10.0.0.1',
+                      '  20 10.1.0.0/16',
+                      'object-group ip port WEB',
+                      '  10 eq 80',
+                      'object-group ipv6 address V6-SERVERS',
+                      '  10 2001:db8::/32',
+                      '!']
+
+IOSXR_OBJECT_GROUPS = ['!! IOS XR Configuration 7.3.2',
+                       'hostname IOSXR-CHECK',
+                       'object-group network ipv4 SERVERS',
+                       ' 10.0.0.1/32',
+                       ' 10.1.0.0/16',
+                       '!',
+                       'object-group network ipv6 V6-SERVERS',
+                       ' 2001:db8::/32',
+                       '!',
+                       'object-group port WEB',
+                       ' eq 80',
+                       '!']
+
+# platform, fixture lines, section kind, and a dictionary of the section name to the number of lines expected
+FIXTURES = (
+    ('ios', IOS_OBJECT_GROUPS, 'object_groups', {'SERVERS': 3, 'WEB': 2}),
+    ('nxos', NXOS_OBJECT_GROUPS, 'object_groups', {'SERVERS': 3, 'WEB': 2, 'V6-SERVERS': 2}),
+    ('iosxr', IOSXR_OBJECT_GROUPS, 'object_groups', {'SERVERS': 3, 'V6-SERVERS': 2, 'WEB': 2}),
+)
+
+
+def check_fixture(platform, lines, kind, expected, config_dir, output_dir):
+    """
+    Function to split one fixture, and check the sections, and the text files
+    :param platform: The platform of the fixture
+    :param lines: The fixture lines
+    :param kind: The section kind to check example object_groups
+    :param expected: A dictionary of section name to the number of lines expected
+    :param config_dir: The directory to write the fixture in
+    :param output_dir: The directory to write the text files in
+    :return:
+        A list of error strings, an empty list if the fixture passed
+
+    """
+    errors = list()
+    file_name = '{platform}-{kind}.txt'.format(platform=platform, kind=kind)
+    with open(os.path.join(config_dir, file_name), 'w') as config_file:
+        config_file.write('\n'.join(lines) + '\n')
+
+    splitter = mod.scripts.ConfigSplitter(file_name, config_dir, platform=platform, lazy=True)
+    sections = getattr(splitter, kind)
+    found = dict((name, len(section_lines)) for name, section_lines in sections.items())
+    if found != expected:
+        errors.append('{platform} {kind} expected {expected} found {found}'.format(platform=platform, kind=kind,
+                                                                                   expected=expected, found=found))
+
+    splitter = mod.scripts.ConfigSplitter(file_name, config_dir, output_dir, True, platform=platform,
+                                          sections=[kind])
+    file_prefix = mod.scripts.config_spliter.SECTION_RULES_DICT[kind].file_prefix
+    host_dir = os.path.join(output_dir, splitter.hostname)
+    for name in expected:
+        section_file = os.path.join(host_dir, '{file_prefix}{name}.txt'.format(file_prefix=file_prefix, name=name))
+        if not os.path.isfile(section_file):
+            errors.append('{platform} {kind} file {section_file} not written'.format(platform=platform, kind=kind,
+                                                                                      section_file=section_file))
+
+    return errors
+
+
+def main():
+    config_dir = tempfile.mkdtemp(prefix='check-configs-')
+    output_dir = tempfile.mkdtemp(prefix='check-output-')
+    errors = list()
+    try:
+        for platform, lines, kind, expected in FIXTURES:
+            fixture_errors = check_fixture(platform, lines, kind, expected, config_dir, output_dir)
+            print('{platform:6} {kind:20} {result}'.format(platform=platform, kind=kind,
+                                                           result='FAIL' if fixture_errors else 'OK'))
+            errors.extend(fixture_errors)
+
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    for error in errors:
+        print(error)
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,17 @@
 from . import prefix_list_differ as pl_diff
+from . import prefix_list_trie
+from . import list_entry
 from . import acl_differ as acl_diff
-from .writexlsx import WriteXlsxDiff, WriteXlsxTabs, WriteXlsxMultiTabDiff, WriteXlsxAggregate
+from .writexlsx import WriteXlsxDiff, WriteXlsxTabs, WriteXlsxStreamTabs, WriteXlsxMultiTabDiff, WriteXlsxAggregate
 from .file_diff import file_diff
 from .file_diff import multi_file_diff
 from .config_spliter import ConfigSplitter
+from .config_spliter import config_split_batch
+from .config_index import ConfigIndex
+from .config_index import config_index_build
+from .config_tree import ConfigTree, ConfigNode
+from .parse_cache import ParseCache
+from .mapped_config import MappedConfig, MappedSection
 from .mcast_acl_rm import AclToRmHits
 from .ip_address_cli import get_subnets
 from .ip_address_cli import get_host_ips
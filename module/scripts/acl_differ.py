@@ -1,12 +1,13 @@
 import logging
 import persistentdatatools as pdt
 import ipaddresstools as ipv4
+import module as mod
 __author__ = 'Benjamin P. Trachtenberg'
 __copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
 __credits__ = 'Benjamin P. Trachtenberg'
 __license__ = ''
 __status__ = 'prod'
-__version_info__ = (1, 0, 1, __status__)
+__version_info__ = (1, 0, 6, __status__)
 __version__ = '.'.join(map(str, __version_info__))
 __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
@@ -27,64 +28,36 @@ class AccessListInformation:
             LOGGER.critical('Expected a list but received a {item_type}'.format(item_type=type(access_list_original)))
             raise TypeError('Expected a list but received a {item_type}'.format(item_type=type(access_list_original)))
 
-        self.access_list_permit_deny_dict = {'permit': list(),
-                                             'deny': list()}
-        self.access_list_permit_statement_matcher = list()
-        self.access_list_deny_statement_matcher = list()
-        self.access_list_parts_list = list()
+        self.access_list_entries = list()
         self.comparison = None
         self.acl_name = None
         self._compile_access_list()
 
-    def _create_acl_permit_deny_dict(self):
+    def _create_access_list_entries(self):
         """
-        Method to create a permit or deny dictionary
+        Method to create the list of entries, the addresses, and wildcard masks are kept as integers
 
         :return:
             None
 
         """
-        LOGGER.debug('Starting Method _create_acl_permit_deny_dict in Class '
+        LOGGER.debug('Starting Method _create_access_list_entries in Class '
                      '{class_type}'.format(class_type=type(self)))
 
         for index, line in enumerate(self.access_list_original):
-            line = ' '.join(line.split())
             line_split = line.split()
-            self.access_list_parts_list.append(line_split)
-            if len(line_split) == 2:
-                if line_split[0] == 'permit':
-                    self.access_list_permit_deny_dict['permit'].append((index, line_split[1]))
-
-                elif line_split[0] == 'deny':
-                    self.access_list_permit_deny_dict['deny'].append((index, line_split[1]))
+            if len(line_split) in (2, 3):
+                entry = mod.scripts.list_entry.make_access_list_entry(line_split, index)
+                if entry:
+                    self.access_list_entries.append(entry)
 
-            elif len(line_split) == 3:
-                if line_split[0] == 'permit':
-                    self.access_list_permit_deny_dict['permit'].append((index, ' '.join(line_split[1:])))
-
-                elif line_split[0] == 'deny':
-                    self.access_list_permit_deny_dict['deny'].append((index, ' '.join(line_split[1:])))
+                elif line_split[0] in ('permit', 'deny'):
+                    LOGGER.warning('Line {index}, is not a valid entry {line}'.format(index=index, line=line_split))
 
             else:
                 LOGGER.warning('Line {index}, did not match a need length {line}'.format(index=index, line=line_split))
                 self.acl_name = line_split[3]
 
-    def _create_match_lists(self):
-        """
-        Method to create a list from the tuples in orig_list
-
-        :return:
-            None
-
-        """
-        LOGGER.debug('Starting Method _create_match_lists in Class {class_type}'.format(class_type=type(self)))
-
-        for orig_tuple in self.access_list_permit_deny_dict['permit']:
-            self.access_list_permit_statement_matcher.append(orig_tuple[1])
-
-        for orig_tuple in self.access_list_permit_deny_dict['deny']:
-            self.access_list_deny_statement_matcher.append(orig_tuple[1])
-
     def _compile_access_list(self):
         """
         Method to compile the prefix-list data
@@ -94,8 +67,7 @@ class AccessListInformation:
 
         """
         LOGGER.debug('Starting Method _compile_access_list in Class {class_type}'.format(class_type=type(self)))
-        self._create_acl_permit_deny_dict()
-        self._create_match_lists()
+        self._create_access_list_entries()
 
     def compare_access_list(self, acl_object, input_file_name):
         """
@@ -120,30 +92,14 @@ class AccessListInformation:
             LOGGER.critical('Tried to run a comparison, when one has already been run!')
             raise FileExistsError('A comparison is already being stored')
 
-        comparison_permit_list = acl_object.get_access_list_permit_statement_matcher()
-        comparison_deny_list = acl_object.get_access_list_deny_statement_matcher()
-
-        for key in self.access_list_permit_deny_dict:
-            for line in self.access_list_permit_deny_dict[key]:
-                if key == 'permit':
-                    if line[1] not in comparison_permit_list:
-                        self.comparison.append(
-                            '{permit_deny} {ip_addr} not in ACL {acl_name} in file '
-                            '{input_file_name}'.format(permit_deny=key,
-                                                       ip_addr=line[1],
-                                                       acl_name=self.acl_name,
-                                                       input_file_name=input_file_name))
-                        self.comparison.append(self.access_list_original[line[0]])
-
-                elif key == 'deny':
-                    if line[1] not in comparison_deny_list:
-                        self.comparison.append(
-                            '{permit_deny} {ip_addr} not in ACL {acl_name} in file '
-                            '{input_file_name}'.format(permit_deny=key,
-                                                       ip_addr=line[1],
-                                                       acl_name=self.acl_name,
-                                                       input_file_name=input_file_name))
-                        self.comparison.append(self.access_list_original[line[0]])
+        for diff_record in get_access_list_missing(self, acl_object, 'A'):
+            self.comparison.append(
+                '{permit_deny} {ip_addr} not in ACL {acl_name} in file '
+                '{input_file_name}'.format(permit_deny=diff_record.action,
+                                           ip_addr=diff_record.prefix,
+                                           acl_name=self.acl_name,
+                                           input_file_name=input_file_name))
+            self.comparison.append(self.access_list_original[diff_record.line_index])
 
         return self.comparison
 
@@ -214,14 +170,38 @@ class AccessListInformation:
 
         return pl_temp
 
+    def get_entry_text(self, entry):
+        """
+        Method to get the text of an entry after the action, from the original line
+        :param entry: A ListEntry of this ACL
+        :return:
+            A string example 10.0.0.0 0.0.0.255
+
+        """
+        return ' '.join(self.access_list_original[entry.line_index].split()[1:])
+
+    def get_list_entries(self):
+        """
+        Method access_list_entries getter
+        :return:
+            A list of ListEntry in file order
+
+        """
+        return self.access_list_entries
+
     def get_access_list_permit_deny_dict(self):
         """
-        Method access_list_permit_deny_dict getter
+        Method access_list_permit_deny_dict getter, made from the entries
         :return:
             A dictionary
 
         """
-        return self.access_list_permit_deny_dict
+        permit_deny_dict = {'permit': list(),
+                            'deny': list()}
+        for entry in self.access_list_entries:
+            permit_deny_dict[entry.action].append((entry.line_index, self.get_entry_text(entry)))
+
+        return permit_deny_dict
 
     def get_access_list_original(self):
         """
@@ -234,30 +214,73 @@ class AccessListInformation:
 
     def get_access_list_permit_statement_matcher(self):
         """
-        Method access_list_permit_statement_matcher getter
+        Method access_list_permit_statement_matcher getter, made from the entries
         :return:
             A List
 
         """
-        return self.access_list_permit_statement_matcher
+        return [self.get_entry_text(entry) for entry in self.access_list_entries if entry.action == 'permit']
 
     def get_access_list_deny_statement_matcher(self):
         """
-        Method access_list_deny_statement_matcher getter
+        Method access_list_deny_statement_matcher getter, made from the entries
         :return:
             A List
 
         """
-        return self.access_list_deny_statement_matcher
+        return [self.get_entry_text(entry) for entry in self.access_list_entries if entry.action == 'deny']
 
     def get_access_list_parts_list(self):
         """
-        Method access_list_parts_list getter
+        Method access_list_parts_list getter, split from the original lines
         :return:
             A List
 
         """
-        return self.access_list_parts_list
+        return [line.split() for line in self.access_list_original]
+
+
+def get_access_list_missing(acl_object, comparison_object, side):
+    """
+    Function to find the entries of an ACL that are not in another, the entries of the other ACL are hashed on
+    their match keys, so each entry is looked up once, neither object is changed
+    :param acl_object: The AccessListInformation to look for missing entries from
+    :param comparison_object: The AccessListInformation to compare to
+    :param side: The side label for the records, A, or B
+    :return:
+        A list of DiffRecord, the prefix is the address, and wildcard of the entry
+
+    """
+    comparison_keys = set(entry.get_match_key() for entry in comparison_object.get_list_entries())
+    diff_records = list()
+    for action in ('permit', 'deny'):
+        for entry in acl_object.get_list_entries():
+            if entry.action == action and entry.get_match_key() not in comparison_keys:
+                diff_records.append(mod.scripts.list_entry.DiffRecord(side, action, acl_object.get_entry_text(entry),
+                                                                      entry.line_index))
+
+    return diff_records
+
+
+def diff_access_lists(acl_object_a, acl_object_b):
+    """
+    Function to diff two parsed ACLs without storing anything in them, so a parsed ACL can be compared to any
+    number of others
+    :param acl_object_a: The "A" side AccessListInformation
+    :param acl_object_b: The "B" side AccessListInformation
+    :return:
+        A list of DiffRecord, the "A" side entries missing from "B", then the "B" side entries missing from "A"
+
+    """
+    for acl_object in (acl_object_a, acl_object_b):
+        if not isinstance(acl_object, AccessListInformation):
+            LOGGER.critical('Function diff_access_lists expected a <AccessListInformation> object but received a '
+                            '{item_type}'.format(item_type=type(acl_object)))
+            raise TypeError('expected a <AccessListInformation> object but received a '
+                            '{item_type}'.format(item_type=type(acl_object)))
+
+    return get_access_list_missing(acl_object_a, acl_object_b, 'A') + \
+        get_access_list_missing(acl_object_b, acl_object_a, 'B')
 
 
 def acl_diff(file_a, file_b, output_file, input_dir, output_dir):
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sqlite3
+import time
+from multiprocessing import Pool
+import module as mod
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 2, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = 'config_index.sqlite3'
+
+# A numbered section name is only a reference when it follows one of these words, so "set metric 10" does not
+# reference "access-list 10"
+NUMBERED_REFERENCE_KEYWORDS = ('address', 'access-group', 'access-class', 'prefix-list', 'community', 'filter-list',
+                               'distribute-list', 'list')
+
+# Bump when the tables change, an index with an older version is dropped, and built again
+INDEX_SCHEMA_VERSION = 2
+INDEX_TABLES = ('devices', 'sections', 'section_lines', 'section_references')
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    file_path TEXT PRIMARY KEY,
+    hostname TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    platform TEXT,
+    line_count INTEGER NOT NULL,
+    section_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS devices_hostname ON devices (hostname);
+CREATE TABLE IF NOT EXISTS sections (
+    section_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    hostname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line_count INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_kind_name ON sections (kind, name);
+CREATE INDEX IF NOT EXISTS sections_name ON sections (name);
+CREATE INDEX IF NOT EXISTS sections_hostname ON sections (hostname, kind);
+CREATE INDEX IF NOT EXISTS sections_digest ON sections (kind, digest);
+CREATE INDEX IF NOT EXISTS sections_file_path ON sections (file_path);
+CREATE TABLE IF NOT EXISTS section_lines (
+    section_id INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    line TEXT NOT NULL,
+    PRIMARY KEY (section_id, line_number)
+);
+CREATE TABLE IF NOT EXISTS section_references (
+    file_path TEXT NOT NULL,
+    hostname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ref_kind TEXT NOT NULL,
+    ref_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS references_ref ON section_references (ref_name, ref_kind);
+CREATE INDEX IF NOT EXISTS references_from ON section_references (hostname, kind, name);
+CREATE INDEX IF NOT EXISTS references_file_path ON section_references (file_path);
+"""
+
+
+class ConfigIndex:
+    """
+    Class for a SQLite index of the split sections of many configs, keyed by config file, section kind, and name,
+    two configs can have the same hostname example a backup, and the current config
+    """
+    def __init__(self, database_path):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.database_path = database_path
+        self.connection = sqlite3.connect(database_path)
+        schema_version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if schema_version != INDEX_SCHEMA_VERSION:
+            LOGGER.info('Index {database_path} is version {schema_version}, it is built again as version '
+                        '{index_version}'.format(database_path=database_path, schema_version=schema_version,
+                                                 index_version=INDEX_SCHEMA_VERSION))
+            with self.connection:
+                for table in INDEX_TABLES:
+                    self.connection.execute('DROP TABLE IF EXISTS {table}'.format(table=table))
+
+        self.connection.executescript(INDEX_SCHEMA)
+        self.connection.execute('PRAGMA user_version = {index_version}'.format(index_version=INDEX_SCHEMA_VERSION))
+
+    def close(self):
+        self.connection.close()
+
+    def get_file_hashes(self):
+        """
+        Method to get the hash of every indexed file
+        :return:
+            A dictionary of file path to file hash
+
+        """
+        return dict(self.connection.execute('SELECT file_path, file_hash FROM devices'))
+
+    def remove_device(self, file_path):
+        """
+        Method to remove a config, and all of its sections from the index
+        :param file_path: The path to the config file
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method remove_device in class {class_obj}'.format(class_obj=type(self)))
+        self.connection.execute('DELETE FROM section_lines WHERE section_id IN '
+                                '(SELECT section_id FROM sections WHERE file_path = ?)', (file_path,))
+        self.connection.execute('DELETE FROM sections WHERE file_path = ?', (file_path,))
+        self.connection.execute('DELETE FROM section_references WHERE file_path = ?', (file_path,))
+        self.connection.execute('DELETE FROM devices WHERE file_path = ?', (file_path,))
+
+    def add_device(self, hostname, file_path, file_hash, platform, line_count, sections):
+        """
+        Method to add, or replace a config in the index, a config with the hostname of another config is added, and
+        a warning is logged
+        :param hostname: The hostname of the device
+        :param file_path: The path to the config file
+        :param file_hash: The hash of the config file
+        :param platform: The platform of the config
+        :param line_count: The number of lines in the config
+        :param sections: A dictionary of section kind to a dictionary of section name to a list of lines
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method add_device in class {class_obj}'.format(class_obj=type(self)))
+        with self.connection:
+            self.remove_device(file_path)
+            for other_file_path, in self.connection.execute('SELECT file_path FROM devices WHERE hostname = ?',
+                                                            (hostname,)).fetchall():
+                LOGGER.warning('{file_path} has the hostname {hostname} of {other_file_path}, the sections of both '
+                               'are indexed'.format(file_path=file_path, hostname=hostname,
+                                                    other_file_path=other_file_path))
+
+            section_count = 0
+            for kind in sections:
+                for name, lines in sections[kind].items():
+                    lines = list(lines)
+                    cursor = self.connection.execute('INSERT INTO sections (file_path, hostname, kind, name, '
+                                                     'line_count, digest) VALUES (?, ?, ?, ?, ?, ?)',
+                                                     (file_path, hostname, kind, name, len(lines),
+                                                      mod.scripts.config_spliter.get_lines_digest(lines)))
+                    self.connection.executemany('INSERT INTO section_lines (section_id, line_number, line) '
+                                                'VALUES (?, ?, ?)',
+                                                ((cursor.lastrowid, line_number, line)
+                                                 for line_number, line in enumerate(lines)))
+                    section_count += 1
+
+            self.connection.executemany('INSERT INTO section_references (file_path, hostname, kind, name, ref_kind, '
+                                        'ref_name) VALUES (?, ?, ?, ?, ?, ?)',
+                                        ((file_path, hostname) + reference
+                                         for reference in get_section_references(sections)))
+            self.connection.execute('INSERT INTO devices (file_path, hostname, file_hash, platform, line_count, '
+                                    'section_count, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                    (file_path, hostname, file_hash, platform, line_count, section_count,
+                                     time.time()))
+
+    def find_sections(self, name=None, kind=None, hostname=None):
+        """
+        Method to find sections, the name, and hostname can use SQL LIKE wildcards
+        :param name: The section name
+        :param kind: The section kind example prefix_lists
+        :param hostname: The hostname of the device
+        :return:
+            A list of tuples of hostname, kind, name, line count, and file path
+
+        """
+        where_sql, parameters = get_where_sql((('name LIKE ?', name), ('kind = ?', kind),
+                                               ('hostname LIKE ?', hostname)))
+        return self.connection.execute('SELECT hostname, kind, name, line_count, file_path FROM sections {where_sql} '
+                                       'ORDER BY hostname, kind, name, file_path'.format(where_sql=where_sql),
+                                       parameters).fetchall()
+
+    def find_references(self, ref_name, ref_kind=None, kind=None, hostname=None):
+        """
+        Method to find the sections that reference a section, the names can use SQL LIKE wildcards
+        :param ref_name: The name of the referenced section
+        :param ref_kind: The kind of the referenced section example community_lists
+        :param kind: The kind of the referencing section example route_maps
+        :param hostname: The hostname of the device
+        :return:
+            A list of tuples of hostname, kind, name, ref kind, and ref name
+
+        """
+        where_sql, parameters = get_where_sql((('ref_name LIKE ?', ref_name), ('ref_kind = ?', ref_kind),
+                                               ('kind = ?', kind), ('hostname LIKE ?', hostname)))
+        return self.connection.execute('SELECT DISTINCT hostname, kind, name, ref_kind, ref_name '
+                                       'FROM section_references {where_sql} '
+                                       'ORDER BY hostname, kind, name'.format(where_sql=where_sql),
+                                       parameters).fetchall()
+
+    def get_section_lines(self, hostname, kind, name, file_path=None):
+        """
+        Method to get the lines of a section
+        :param hostname: The hostname of the device
+        :param kind: The section kind
+        :param name: The section name
+        :param file_path: The path to the config file, only needed when two configs have the same hostname
+        :return:
+            A list of lines
+
+        """
+        where_sql, parameters = get_where_sql((('sections.hostname = ?', hostname), ('sections.kind = ?', kind),
+                                               ('sections.name = ?', name), ('sections.file_path = ?', file_path)))
+        return [row[0] for row in self.connection.execute(
+            'SELECT section_lines.line FROM sections JOIN section_lines USING (section_id) {where_sql} '
+            'ORDER BY sections.file_path, section_lines.line_number'.format(where_sql=where_sql), parameters)]
+
+    def search_lines(self, pattern, kind=None, hostname=None):
+        """
+        Method to find the sections with a line that matches a SQL LIKE pattern
+        :param pattern: The pattern example %65000:100%
+        :param kind: The section kind
+        :param hostname: The hostname of the device
+        :return:
+            A list of tuples of hostname, kind, name, and line
+
+        """
+        where_sql, parameters = get_where_sql((('section_lines.line LIKE ?', pattern), ('sections.kind = ?', kind),
+                                               ('sections.hostname LIKE ?', hostname)))
+        return self.connection.execute('SELECT sections.hostname, sections.kind, sections.name, section_lines.line '
+                                       'FROM sections JOIN section_lines USING (section_id) {where_sql} '
+                                       'ORDER BY sections.hostname, sections.kind, sections.name, '
+                                       'section_lines.line_number'.format(where_sql=where_sql),
+                                       parameters).fetchall()
+
+
+def get_where_sql(conditions):
+    """
+    Function to make a SQL where clause from the conditions that have a value
+    :param conditions: An iterable of tuples of SQL condition, and value
+    :return:
+        A tuple of the where clause, and a list of parameters
+
+    """
+    sql_list = list()
+    parameters = list()
+    for sql, value in conditions:
+        if value is not None:
+            sql_list.append(sql)
+            parameters.append(value)
+
+    if not sql_list:
+        return '', parameters
+
+    return 'WHERE {conditions}'.format(conditions=' AND '.join(sql_list)), parameters
+
+
+def iter_reference_lines(name, lines):
+    """
+    Function to get the lines of a section to look for references in, the lines stop at the first line in column 0
+    that does not begin the same section, because a config without ! lines example NX-OS leaves the top level lines
+    after an interface in the interface section
+    :param name: The section name
+    :param lines: A list of the lines in the section
+    :return:
+        A generator of lines
+
+    """
+    first_word = None
+    for line in lines:
+        if line[:1] not in (' ', '\t') and line.strip():
+            line_split = line.split()
+            if first_word is None:
+                first_word = line_split[0]
+
+            elif line_split[0] != first_word or name not in line_split:
+                return
+
+        yield line
+
+
+def get_section_references(sections):
+    """
+    Function to find where a section names another section of the same config
+    :param sections: A dictionary of section kind to a dictionary of section name to a list of lines
+    :return:
+        A set of tuples of kind, name, ref kind, and ref name
+
+    """
+    name_kinds = dict()
+    for kind in sections:
+        for name in sections[kind]:
+            name_kinds.setdefault(name, list()).append(kind)
+
+    references = set()
+    for kind in sections:
+        for name, lines in sections[kind].items():
+            for line in iter_reference_lines(name, lines):
+                previous_word = None
+                for word in line.replace(',', ' ').split():
+                    if word in name_kinds and (not word.isdigit() or previous_word in NUMBERED_REFERENCE_KEYWORDS):
+                        for ref_kind in name_kinds[word]:
+                            if (ref_kind, word) != (kind, name):
+                                references.add((kind, name, ref_kind, word))
+
+                    previous_word = word
+
+    return references
+
+
+def config_index_worker(index_args):
+    """
+    Function to split one config for the index in a worker process, the config is not split if its hash has
+    not changed, the platform is part of the hash, so indexing with another platform splits the config again
+    :param index_args: A tuple of file path, previous file hash, and platform
+    :return:
+        A tuple of file path, file hash, hostname, platform, line count, sections, and error message or None,
+        sections is None when the file has not changed
+
+    """
+    file_path, previous_hash, platform = index_args
+    try:
+        file_hash = mod.scripts.ParseCache.make_key(file_path, '{parser_version} {platform}'.format(
+            parser_version=mod.scripts.config_spliter.get_parser_version(), platform=platform))
+        if file_hash == previous_hash:
+            return file_path, file_hash, None, None, 0, None, None
+
+        splitter = mod.scripts.ConfigSplitter(os.path.basename(file_path), os.path.dirname(file_path), None,
+                                              platform=platform, write_output=False)
+        sections = dict()
+        for kind, kind_sections in splitter.get_sections().items():
+            sections[kind] = dict((name, list(lines)) for name, lines in kind_sections.items())
+
+        hostname = splitter.hostname or os.path.basename(file_path)
+        return file_path, file_hash, hostname, splitter.platform, splitter.line_count, sections, None
+
+    except Exception as e:
+        LOGGER.error('Failed to index {file_path} {error}'.format(file_path=file_path, error=e))
+        return file_path, None, None, None, 0, None, str(e)
+
+
+def config_index_build(file_pattern, input_dir, database_path, workers=None, platform='auto'):
+    """
+    Function to split a folder, or glob of configs across a pool of processes, and load the sections into the index,
+    configs that have not changed since they were indexed are skipped
+    :param file_pattern: A folder name, or a glob pattern in the input directory
+    :param input_dir: The input directory
+    :param database_path: The path to the SQLite index
+    :param workers: The number of worker processes, defaults to the number of CPUs
+    :param platform: auto to detect the platform of each config, all for every platform, or ios, nxos, iosxr
+    :return:
+        A list of the worker results
+
+    """
+    LOGGER.debug('Starting Function config_index_build')
+    file_paths = mod.scripts.config_spliter.get_config_file_paths(file_pattern, input_dir)
+    config_index = ConfigIndex(database_path)
+    start_time = time.time()
+    try:
+        file_hashes = config_index.get_file_hashes()
+        index_args = [(file_path, file_hashes.get(file_path), platform) for file_path in file_paths]
+        results = list()
+        with Pool(workers) as pool:
+            for result in pool.imap_unordered(config_index_worker, index_args, chunksize=4):
+                file_path, file_hash, hostname, config_platform, line_count, sections, error = result
+                if sections is not None:
+                    config_index.add_device(hostname, file_path, file_hash, config_platform, line_count, sections)
+
+                results.append(result)
+
+    finally:
+        config_index.close()
+
+    elapsed = time.time() - start_time
+    failed = [result for result in results if result[6]]
+    indexed = [result for result in results if result[5] is not None]
+    print('Indexed {indexed} of {total} configs in {elapsed:.1f} seconds, {unchanged} unchanged'.format(
+        indexed=len(indexed), total=len(results), elapsed=elapsed,
+        unchanged=len(results) - len(indexed) - len(failed)))
+    for result in failed:
+        print('Failed: {file_path} {error}'.format(file_path=result[0], error=result[6]))
+
+    return results
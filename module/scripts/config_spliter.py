@@ -2,6 +2,12 @@
 import logging
 import re
 import os
+import glob
+import hashlib
+import json
+import time
+from collections import namedtuple, OrderedDict
+from multiprocessing import Pool
 import persistentdatatools as pdt
 import module as mod
 __author__ = 'Benjamin P. Trachtenberg'
@@ -9,566 +15,1071 @@ __copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
 __credits__ = ''
 __license__ = ''
 __status__ = 'prod'
-__version_info__ = (1, 0, 1, __status__)
+__version_info__ = (1, 0, 9, __status__)
 __version__ = '.'.join(map(str, __version_info__))
 __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
 
 LOGGER = logging.getLogger(__name__)
 
+SectionRule = namedtuple('SectionRule', ['kind', 'begin', 'name_index', 'members', 'ends', 'bangs', 'file_prefix',
+                                         'tab_name', 'attribute', 'fallback_for'])
+SectionRule.__new__.__defaults__ = (None, ())
+
+ALL_LINES = '*'
+MANIFEST_FILE_NAME = '.configsplit.json'
+
+LINE_CLASSES = [
+    ('hostname', r'hostname'),
+    ('bang', r'!$'),
+    ('comment', r'!'),
+    ('end_set', r'end-set'),
+    ('end_policy', r'end-policy'),
+    ('permit_deny', r'(?:permit|deny)'),
+    ('seq_permit_deny', r'[0-9]+ (?:permit|deny)'),
+    ('seq_remark', r'[0-9]+ remark'),
+    ('route_map_entry', r'(?:description|match|set)'),
+]
+
+SECTION_RULES = [
+    SectionRule('standard_acls', r'ip access-list standard', 3, ('permit_deny',), (), ('bang',),
+                'STANDARD-ACL-', 'STANDARD_ACLS', 'standard_acls'),
+    SectionRule('extended_acls', r'ip access-list extended', 3, ('permit_deny',), (), ('bang',),
+                'EXTENDED-ACL-', 'EXTENDED_ACLS', 'extended_acls'),
+    SectionRule('nxos_acls', r'ip access-list', 2, ('seq_permit_deny',), (), ('bang',),
+                'ACL-', 'NXOS_ACLS', 'nxos_acls', ('standard_acls', 'extended_acls')),
+    SectionRule('iosxr_acls', r'ipv4 access-list', 2, ('seq_permit_deny', 'seq_remark'), (), ('bang',),
+                'ACL-', 'IOSXR_ACLS', 'iosxr_acls', ('standard_acls', 'extended_acls', 'nxos_acls')),
+    SectionRule('interfaces', r'interface', 1, ALL_LINES, (), ('bang', 'comment'),
+                'INTERFACES', 'INTERFACES'),
+    SectionRule('prefix_lists', r'ip prefix-list', 2, (), (), ('bang',),
+                'PREFIX-LIST-', 'PREFIX_LISTS', 'prefix_lists'),
+    SectionRule('prefix_sets', r'prefix-set', 1, ALL_LINES, ('end_set',), ('bang',),
+                'PREFIX-SET-', 'PREFIX_SETS', 'prefix_lists', ('prefix_lists',)),
+    SectionRule('route_maps', r'route-map (?:[A-Z]|_|[0-9]|-)+ (?:permit|deny)', 1, ('route_map_entry',), (),
+                ('bang',), 'ROUTE-MAP-', 'ROUTE_MAPS', 'route_maps'),
+    SectionRule('route_policies', r'route-policy', 1, ALL_LINES, ('end_policy',), ('bang',),
+                'ROUTE-POLICY-', 'ROUTE_POLICIES', 'route_maps', ('route_maps',)),
+    SectionRule('standard_community_lists', r'ip community-list standard', 3, (), (), ('bang',),
+                'STANDARD-CL-', 'STANDARD_COMMUNITY_LISTS', 'standard_community_lists'),
+    SectionRule('community_sets', r'community-set', 1, ALL_LINES, ('end_set',), ('bang',),
+                'CS-', 'COMMUNITY_SETS', 'standard_community_lists', ('standard_community_lists',)),
+    SectionRule('ipv6_prefix_lists', r'ipv6 prefix-list', 2, (), (), ('bang',),
+                'IPV6-PREFIX-LIST-', 'IPV6_PREFIX_LISTS', 'ipv6_prefix_lists'),
+    SectionRule('object_groups', r'object-group', -1, ALL_LINES, (), ('bang', 'comment'),
+                'OBJECT-GROUP-', 'OBJECT_GROUPS', 'object_groups'),
+]
+
+SECTION_RULES_DICT = dict()
+SECTION_CLASSIFIER = None
+
+PLATFORM_SECTION_KINDS = {
+    'ios': ('standard_acls', 'extended_acls', 'interfaces', 'prefix_lists', 'route_maps', 'standard_community_lists',
+            'ipv6_prefix_lists', 'object_groups'),
+    'nxos': ('nxos_acls', 'interfaces', 'prefix_lists', 'route_maps', 'standard_community_lists', 'ipv6_prefix_lists',
+             'object_groups'),
+    'iosxr': ('iosxr_acls', 'interfaces', 'prefix_sets', 'route_policies', 'community_sets', 'object_groups'),
+}
+
+PLATFORM_HEAD_LINES = 500
+
+# A ! line closes every open section, so a config can be cut after one, and the shards split on their own
+SHARD_BOUNDARY_REGEX = re.compile(br'^\s*!\s*$')
+MIN_SHARD_SIZE = 1024 * 1024
+SHARDS_PER_WORKER = 2
+
+PLATFORM_INDICATORS = (
+    (re.compile(r'^!! IOS XR'), 'iosxr', 10),
+    (re.compile(r'^RP/[0-9]+/'), 'iosxr', 5),
+    (re.compile(r'^(prefix-set|route-policy|community-set|end-set|end-policy|ipv4 access-list)\b'), 'iosxr', 3),
+    (re.compile(r'^!Command: show running-config'), 'nxos', 5),
+    (re.compile(r'^version [0-9]+\.[0-9]+\([0-9]+\)'), 'nxos', 5),
+    (re.compile(r'^feature \S+'), 'nxos', 3),
+    (re.compile(r'^version [0-9]+\.[0-9]+$'), 'ios', 3),
+    (re.compile(r'^(boot-start-marker|service timestamps)'), 'ios', 2),
+    (re.compile(r'^ip access-list (standard|extended) '), 'ios', 3),
+)
+
+
+def compile_section_classifier():
+    """
+    Function to compile the section rules, and line classes into one regex with a named group for each,
+    the begin patterns come first so the first matching rule claims the line
+    :return:
+        None
+
+    """
+    global SECTION_CLASSIFIER
+    LOGGER.debug('Starting Function compile_section_classifier')
+    SECTION_RULES_DICT.clear()
+    patterns = list()
+    for rule in SECTION_RULES:
+        SECTION_RULES_DICT[rule.kind] = rule
+        patterns.append('(?P<{name}>{pattern})'.format(name=rule.kind, pattern=rule.begin))
+
+    for class_name, pattern in LINE_CLASSES:
+        patterns.append('(?P<{name}>{pattern})'.format(name=class_name, pattern=pattern))
+
+    SECTION_CLASSIFIER = re.compile('|'.join(patterns), re.IGNORECASE)
+
+
+def register_section_rule(section_rule, line_classes=None):
+    """
+    Function to add a new section type to the registry
+    :param section_rule: A SectionRule
+    :param line_classes: A list of (name, pattern) tuples for any new member, or terminator lines
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function register_section_rule')
+    if section_rule.kind in SECTION_RULES_DICT:
+        LOGGER.critical('Section rule {kind} already exists'.format(kind=section_rule.kind))
+        raise ValueError('Section rule {kind} already exists'.format(kind=section_rule.kind))
+
+    SECTION_RULES.append(section_rule)
+    if line_classes:
+        LINE_CLASSES.extend(line_classes)
+
+    compile_section_classifier()
+
+
+def get_section_rules(sections=None, platform=None):
+    """
+    Function to get the section rules to parse, a requested name matches a rule kind, or the attribute a rule
+    fills, so prefix_lists also selects IOS-XR prefix_sets
+    :param sections: An iterable of section names, None for all sections, a warning is logged for the names the
+                     platform does not have
+    :param platform: ios, nxos, or iosxr to only use the rules for that platform, None for all platforms
+    :return:
+        A OrderedDict of kind to SectionRule
+
+    """
+    LOGGER.debug('Starting Function get_section_rules')
+    platform_rules = SECTION_RULES
+    if platform:
+        if platform not in PLATFORM_SECTION_KINDS:
+            LOGGER.critical('Unknown platform {platform}'.format(platform=platform))
+            raise ValueError('Unknown platform {platform}, valid platforms are '
+                             '{valid}'.format(platform=platform, valid=', '.join(sorted(PLATFORM_SECTION_KINDS))))
+
+        platform_rules = [rule for rule in SECTION_RULES if rule.kind in PLATFORM_SECTION_KINDS[platform] or
+                          not any(rule.kind in kinds for kinds in PLATFORM_SECTION_KINDS.values())]
+
+    if not sections:
+        return OrderedDict((rule.kind, rule) for rule in platform_rules)
+
+    sections = set(sections)
+    section_rules = OrderedDict((rule.kind, rule) for rule in platform_rules
+                                if rule.kind in sections or rule.attribute in sections)
+    known_names = set(SECTION_RULES_DICT) | set(rule.attribute for rule in SECTION_RULES)
+    unknown_names = sections - known_names
+    if unknown_names:
+        LOGGER.critical('Unknown sections {names}'.format(names=sorted(unknown_names)))
+        raise ValueError('Unknown sections {names}, valid sections are '
+                         '{valid}'.format(names=', '.join(sorted(unknown_names)),
+                                          valid=', '.join(sorted(name for name in known_names if name))))
+
+    dropped_names = get_dropped_sections(sections, section_rules)
+    if dropped_names:
+        LOGGER.warning('Sections {names} are not split for the {platform} platform, its sections are '
+                       '{valid}'.format(names=', '.join(dropped_names), platform=platform,
+                                        valid=', '.join(rule.kind for rule in platform_rules)))
+
+    return section_rules
+
+
+def get_dropped_sections(sections, section_rules):
+    """
+    Function to get the requested section names that no section rule of the platform splits
+    :param sections: An iterable of section names, None for all sections
+    :param section_rules: A OrderedDict of kind to SectionRule from get_section_rules
+    :return:
+        A sorted list of section names
+
+    """
+    return sorted(set(name for name in sections or ()
+                      if not any(name in (rule.kind, rule.attribute) for rule in section_rules.values())))
+
+
+def detect_platform(file_name, file_location, head_lines=PLATFORM_HEAD_LINES):
+    """
+    Function to guess the platform of a show run from the head of the file, banner, version, and feature lines
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :param head_lines: The number of lines to read
+    :return:
+        ios, nxos, iosxr, or None if the platform is not clear
+
+    """
+    LOGGER.debug('Starting Function detect_platform')
+    scores = dict.fromkeys(PLATFORM_SECTION_KINDS, 0)
+    for line_number, line in enumerate(iter_file_lines(file_name, file_location)):
+        if line_number >= head_lines:
+            break
+
+        for indicator_regex, platform, weight in PLATFORM_INDICATORS:
+            if indicator_regex.match(line):
+                scores[platform] += weight
+
+    ranked = sorted(scores.items(), key=lambda score: score[1], reverse=True)
+    if ranked[0][1] and ranked[0][1] > ranked[1][1]:
+        LOGGER.debug('Detected platform {platform} {scores}'.format(platform=ranked[0][0], scores=scores))
+        return ranked[0][0]
+
+    LOGGER.warning('Could not detect the platform of {file_name} {scores}'.format(file_name=file_name,
+                                                                                   scores=scores))
+    return None
+
+
+compile_section_classifier()
+
+
+class LazySection:
+    """
+    Descriptor for a ConfigSplitter attribute in lazy mode, the first access splits only the sections the
+    attribute needs, the result is kept in the instance, so later lookups do not reach the descriptor
+    """
+    def __init__(self, attribute):
+        self.attribute = attribute
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        instance.load_sections([self.attribute])
+        return instance.__dict__[self.attribute]
+
 
 class ConfigSplitter:
     """
-    Method to split a Cisco config
+    Method to split a Cisco config, with lazy=True the config is only opened, each section attribute is split on
+    first access, and nothing is written
     """
-    def __init__(self, file_name, input_dir, output_dir, output_text_files=False):
+    hostname = LazySection('hostname')
+    standard_acls = LazySection('standard_acls')
+    extended_acls = LazySection('extended_acls')
+    nxos_acls = LazySection('nxos_acls')
+    iosxr_acls = LazySection('iosxr_acls')
+    prefix_lists = LazySection('prefix_lists')
+    route_maps = LazySection('route_maps')
+    standard_community_lists = LazySection('standard_community_lists')
+    ipv6_prefix_lists = LazySection('ipv6_prefix_lists')
+    object_groups = LazySection('object_groups')
+    interfaces = LazySection('interfaces')
+
+    def __init__(self, file_name, input_dir, output_dir=None, output_text_files=False, stream=False, cache_dir=None,
+                 incremental=False, mmap_storage=False, sections=None, platform='auto', write_output=True,
+                 lazy=False, parse_workers=None, shard=None):
         LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.file_name = file_name
         self.input_dir = input_dir
         self.output_dir = output_dir
-        self.orig_config = pdt.file_to_list(file_name, self.input_dir)
         self.output_text_files = output_text_files
-        self.hostname = None
-        self.standard_acls = dict()
-        self.extended_acls = dict()
-        self.nxos_acls = dict()
-        self.iosxr_acls = dict()
-        self.prefix_lists = dict()
-        self.route_maps = dict()
-        self.standard_community_lists = dict()
-        self.interfaces = list()
-        self.__get_hostname()
-        self.__split_config()
-
-    def __get_hostname(self):
-        LOGGER.debug('Starting method __get_hostname in class {class_obj}'.format(class_obj=type(self)))
-        hostname_regex = re.compile(r'^hostname', re.IGNORECASE)
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if hostname_regex.match(match_line):
-                hostname_split = match_line.split()
-                self.hostname = hostname_split[1]
-
-    def __split_standard_acls(self):
-        LOGGER.debug('Starting method __split_standard_acls in class {class_obj}'.format(class_obj=type(self)))
-        standard_acl_regex = re.compile(r'^ip access-list standard', re.IGNORECASE)
-        permit_regex = re.compile(r'^permit')
-        deny_regex = re.compile(r'^deny')
-        bang_regex = re.compile(r'^!$')
-        acl_name = None
-        acl_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if standard_acl_regex.match(match_line):
-                acl_line_split = match_line.split()
-                acl_name = acl_line_split[3]
-                if acl_found:
-                    if not self.standard_acls.get(acl_name):
-                        self.standard_acls.update({acl_name: list()})
-                    self.standard_acls[acl_name].append(line)
-                else:
-                    self.standard_acls.update({acl_name: list()})
-                    acl_found = True
-                    self.standard_acls[acl_name].append(line)
-
-            elif bang_regex.match(match_line):
-                acl_found = False
-
-            elif permit_regex.match(match_line) and acl_found:
-                self.standard_acls[acl_name].append(line)
-
-            elif deny_regex.match(match_line) and acl_found:
-                self.standard_acls[acl_name].append(line)
-
-    def __split_extended_acls(self):
-        LOGGER.debug('Starting method __split_extended_acls in class {class_obj}'.format(class_obj=type(self)))
-        extended_acl_regex = re.compile(r'^ip access-list extended', re.IGNORECASE)
-        permit_regex = re.compile(r'^permit')
-        deny_regex = re.compile(r'^deny')
-        bang_regex = re.compile(r'^!$')
-        acl_name = None
-        acl_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if extended_acl_regex.match(match_line):
-                acl_line_split = match_line.split()
-                acl_name = acl_line_split[3]
-                if acl_found:
-                    if not self.extended_acls.get(acl_name):
-                        self.extended_acls.update({acl_name: list()})
-                    self.extended_acls[acl_name].append(line)
-                else:
-                    acl_found = True
-                    self.extended_acls.update({acl_name: list()})
-                    self.extended_acls[acl_name].append(line)
-
-            elif bang_regex.match(match_line):
-                acl_found = False
-
-            elif permit_regex.match(match_line) and acl_found:
-                self.extended_acls[acl_name].append(line)
-
-            elif deny_regex.match(match_line) and acl_found:
-                self.extended_acls[acl_name].append(line)
-
-    def __split_nxos_acls(self):
-        LOGGER.debug('Starting method __split_nxos_acls in class {class_obj}'.format(class_obj=type(self)))
-        acl_regex = re.compile(r'^ip access-list', re.IGNORECASE)
-        permit_regex = re.compile(r'^[0-9]+ permit')
-        deny_regex = re.compile(r'^[0-9]+ deny')
-        bang_regex = re.compile(r'^!$')
-        acl_name = None
-        acl_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if acl_regex.match(match_line):
-                acl_line_split = match_line.split()
-                acl_name = acl_line_split[2]
-                if acl_found:
-                    if not self.nxos_acls.get(acl_name):
-                        self.nxos_acls.update({acl_name: list()})
-                    self.nxos_acls[acl_name].append(line)
-                else:
-                    acl_found = True
-                    self.nxos_acls.update({acl_name: list()})
-                    self.nxos_acls[acl_name].append(line)
-
-            elif bang_regex.match(match_line):
-                acl_found = False
-
-            elif permit_regex.match(match_line) and acl_found:
-                self.nxos_acls[acl_name].append(line)
-
-            elif deny_regex.match(match_line) and acl_found:
-                self.nxos_acls[acl_name].append(line)
-
-    def __split_iosxr_acls(self):
-        LOGGER.debug('Starting method __split_iosxr_acls in class {class_obj}'.format(class_obj=type(self)))
-        acl_regex = re.compile(r'^ipv4 access-list', re.IGNORECASE)
-        permit_regex = re.compile(r'^[0-9]+ permit')
-        deny_regex = re.compile(r'^[0-9]+ deny')
-        remark_regex = re.compile(r'^[0-9]+ remark')
-        bang_regex = re.compile(r'^!$')
-        acl_name = None
-        acl_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if acl_regex.match(match_line):
-                acl_line_split = match_line.split()
-                acl_name = acl_line_split[2]
-                if acl_found:
-                    if not self.iosxr_acls.get(acl_name):
-                        self.iosxr_acls.update({acl_name: list()})
-                    self.iosxr_acls[acl_name].append(line)
-                else:
-                    acl_found = True
-                    self.iosxr_acls.update({acl_name: list()})
-                    self.iosxr_acls[acl_name].append(line)
-
-            elif bang_regex.match(match_line):
-                acl_found = False
-
-            elif permit_regex.match(match_line) and acl_found:
-                self.iosxr_acls[acl_name].append(line)
-
-            elif deny_regex.match(match_line) and acl_found:
-                self.iosxr_acls[acl_name].append(line)
-
-            elif remark_regex.match(match_line) and acl_found:
-                self.iosxr_acls[acl_name].append(line)
-
-    def __split_interfaces(self):
-        LOGGER.debug('Starting method __split_interfaces in class {class_obj}'.format(class_obj=type(self)))
-        interface_regex = re.compile(r'^interface', re.IGNORECASE)
-        bang_regex = re.compile(r'^!', re.IGNORECASE)
-        interface_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if interface_regex.match(match_line):
-                interface_found = True
-                self.interfaces.append('!')
-                self.interfaces.append(line)
-
-            elif bang_regex.match(match_line):
-                interface_found = False
-
-            elif interface_found:
-                self.interfaces.append(line)
+        self.lazy = lazy
+        self.write_output = write_output and not lazy
+        self.stream = stream and self.write_output
+        self.cache_dir = None if lazy else cache_dir
+        self.incremental = incremental and not self.stream and self.write_output
+        self.parse_workers = parse_workers
+        self.shard = shard
+        self.mmap_storage = mmap_storage and not stream
+        if platform == 'auto':
+            platform = detect_platform(file_name, input_dir)
+
+        elif platform == 'all':
+            platform = None
+
+        self.platform = platform
+        self.section_rules = get_section_rules(sections, self.platform)
+        self.orig_config = None
+        if not self.lazy:
+            self.hostname = None
+            self.standard_acls = dict()
+            self.extended_acls = dict()
+            self.nxos_acls = dict()
+            self.iosxr_acls = dict()
+            self.prefix_lists = dict()
+            self.route_maps = dict()
+            self.standard_community_lists = dict()
+            self.ipv6_prefix_lists = dict()
+            self.object_groups = dict()
+            self.interfaces = list()
+
+        self.config_tree = None
+        self.line_count = 0
+        self.section_count = 0
+        self.changed_outputs = list()
+        self.stage_times = OrderedDict()
+        self.__sections = dict()
+        self.__output_sections = list()
+        self.__spreadsheet_obj = None
+        self.__mapped_config = None
+        self.__manifest = None
+        self.__file_hash = None
+        if self.lazy:
+            LOGGER.debug('Lazy mode, sections are split on first access')
+
+        elif self.stream:
+            self.__stream_config()
+
+        elif self.incremental and self.__previous_split_unchanged():
+            LOGGER.info('{file_name} has not changed since the previous split'.format(file_name=file_name))
+
+        elif self.cache_dir:
+            self.__split_sections_cached()
+            if self.write_output:
+                self.__split_config()
+                self.close()
 
-    def __split_prefix_lists(self):
-        LOGGER.debug('Starting method __split_prefix_lists in class {class_obj}'.format(class_obj=type(self)))
-        prefix_list_regex = re.compile(r'^ip prefix-list', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        prefix_list_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if prefix_list_regex.match(match_line):
-                prefix_list_line_split = match_line.split()
-                prefix_list_name = prefix_list_line_split[2]
-                if prefix_list_found:
-                    if not self.prefix_lists.get(prefix_list_name):
-                        self.prefix_lists.update({prefix_list_name: list()})
-                    self.prefix_lists[prefix_list_name].append(line)
-                else:
-                    prefix_list_found = True
-                    self.prefix_lists.update({prefix_list_name: list()})
-                    self.prefix_lists[prefix_list_name].append(line)
-
-            elif bang_regex.match(match_line):
-                prefix_list_found = False
-
-    def __split_prefix_sets(self):
-        LOGGER.debug('Starting method __split_prefix_sets in class {class_obj}'.format(class_obj=type(self)))
-        prefix_set_begin_regex = re.compile(r'^prefix-set', re.IGNORECASE)
-        prefix_set_end_regex = re.compile(r'^end-set', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        prefix_set_found = False
-        prefix_list_name = None
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if prefix_set_begin_regex.match(match_line):
-                prefix_list_line_split = match_line.split()
-                prefix_list_name = prefix_list_line_split[1]
-                if prefix_set_found:
-                    if not self.prefix_lists.get(prefix_list_name):
-                        self.prefix_lists.update({prefix_list_name: list()})
-                    self.prefix_lists[prefix_list_name].append(line)
-                else:
-                    prefix_set_found = True
-                    self.prefix_lists.update({prefix_list_name: list()})
-                    self.prefix_lists[prefix_list_name].append(line)
-
-            elif bang_regex.match(match_line):
-                prefix_set_found = False
-
-            elif prefix_set_end_regex.match(match_line) and prefix_set_found:
-                self.prefix_lists[prefix_list_name].append(line)
-                prefix_set_found = False
-
-            elif prefix_set_found:
-                self.prefix_lists[prefix_list_name].append(line)
-
-    def __split_route_maps(self):
-        LOGGER.debug('Starting method __split_route_maps in class {class_obj}'.format(class_obj=type(self)))
-        route_map_regex = re.compile(r'^route-map ([A-Z]|_|[0-9]|-)+ (permit|deny)', re.IGNORECASE)
-        description_regex = re.compile(r'^description', re.IGNORECASE)
-        match_regex = re.compile(r'^match', re.IGNORECASE)
-        set_regex = re.compile(r'^set', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        route_map_name = None
-        route_map_found = False
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if route_map_regex.match(match_line):
-                route_map_line_split = match_line.split()
-                route_map_name = route_map_line_split[1]
-                if route_map_found:
-                    if not self.route_maps.get(route_map_name):
-                        self.route_maps.update({route_map_name: list()})
-                    self.route_maps[route_map_name].append(line)
-                else:
-                    route_map_found = True
-                    if not self.route_maps.get(route_map_name):
-                        self.route_maps.update({route_map_name: list()})
-                    self.route_maps[route_map_name].append(line)
-
-            elif bang_regex.match(match_line):
-                route_map_found = False
-
-            elif description_regex.match(match_line) and route_map_found:
-                self.route_maps[route_map_name].append(line)
-
-            elif match_regex.match(match_line) and route_map_found:
-                self.route_maps[route_map_name].append(line)
-
-            elif set_regex.match(match_line) and route_map_found:
-                self.route_maps[route_map_name].append(line)
-
-    def __split_route_policies(self):
-        LOGGER.debug('Starting method __split_route_policies in class {class_obj}'.format(class_obj=type(self)))
-        route_policy_begin_regex = re.compile(r'^route-policy', re.IGNORECASE)
-        route_policy_end_regex = re.compile(r'^end-policy', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        route_policy_found = False
-        route_policy_name = None
-
-        for line in self.orig_config:
+        else:
+            self.__split_sections()
+            if self.write_output:
+                self.__split_config()
+                self.close()
+
+    def close(self):
+        """
+        Method to close the memory mapped config, the sections are written before it is closed, with
+        write_output=False the sections can be used until it is closed
+        :return:
+            None
+
+        """
+        if self.__mapped_config:
+            self.__mapped_config.close()
+            self.__mapped_config = None
+
+    def __walk_config(self, config_lines, section_handler, config_tree=None):
+        """
+        Method to walk the config once, and split every section type in that one pass
+        :param config_lines: An iterable of tuples of the config line, and the item to keep for the line
+        :param section_handler: Called with the rule, name, and line items of each section as it is finished
+        :param config_tree: A ConfigTree to add every line to
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __walk_config in class {class_obj}'.format(class_obj=type(self)))
+        open_sections = dict()
+
+        for line, line_item in config_lines:
+            self.line_count += 1
             match_line = pdt.remove_extra_spaces(line)
-            if route_policy_begin_regex.match(match_line):
-                route_policy_line_split = match_line.split()
-                route_policy_name = route_policy_line_split[1]
-                if route_policy_found:
-                    if not self.route_maps.get(route_policy_name):
-                        self.route_maps.update({route_policy_name: list()})
-                    self.route_maps[route_policy_name].append(line)
-                else:
-                    route_policy_found = True
-                    self.route_maps.update({route_policy_name: list()})
-                    self.route_maps[route_policy_name].append(line)
-
-            elif bang_regex.match(match_line):
-                route_policy_found = False
-
-            elif route_policy_end_regex.match(match_line) and route_policy_found:
-                self.route_maps[route_policy_name].append(line)
-                route_policy_found = False
-
-            elif route_policy_found:
-                self.route_maps[route_policy_name].append(line)
-
-    def __split_standard_community_lists(self):
-        LOGGER.debug('Starting method __split_standard_community_lists in class '
-                     '{class_obj}'.format(class_obj=type(self)))
-        standard_community_list_regex = re.compile(r'^ip community-list standard', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        community_list_found = False
+            line_match = SECTION_CLASSIFIER.match(match_line)
+            line_class = line_match.lastgroup if line_match else None
+            if line_class in SECTION_RULES_DICT and line[:1] in (' ', '\t'):
+                # A begin line under another block is a reference example route-policy RP-0 in under router bgp
+                line_class = None
+
+            if line_class == 'hostname' and not self.hostname:
+                self.hostname = match_line.split()[1]
+
+            for kind in list(open_sections):
+                rule = self.section_rules[kind]
+                if kind == line_class or line_class in rule.bangs:
+                    section_handler(rule, *open_sections.pop(kind))
+
+                elif line_class in rule.ends:
+                    open_sections[kind][1].append(line_item)
+                    section_handler(rule, *open_sections.pop(kind))
+
+                elif rule.members == ALL_LINES or line_class in rule.members:
+                    open_sections[kind][1].append(line_item)
+
+            begin_rule = self.section_rules.get(line_class)
+            if begin_rule:
+                section_name = get_section_name(match_line, begin_rule.name_index)
+                open_sections[begin_rule.kind] = (section_name, [line_item])
+                if config_tree:
+                    config_tree.add_line(line, begin_rule.kind, section_name)
+
+            elif config_tree:
+                config_tree.add_line(line)
+
+        for kind in open_sections:
+            section_handler(self.section_rules[kind], *open_sections[kind])
+
+    def __store_section(self, rule, section_name, section_lines):
+        """
+        Method to keep a finished section in memory
+        :param rule: The SectionRule of the section
+        :param section_name: The name of the section
+        :param section_lines: A list of the lines in the section
+        :return:
+            None
+
+        """
+        if section_name not in self.__sections[rule.kind]:
+            self.__sections[rule.kind][section_name] = self.__new_section()
+            self.section_count += 1
+
+        self.__sections[rule.kind][section_name].extend(section_lines)
+
+    def __new_section(self):
+        if self.__mapped_config:
+            return mod.scripts.MappedSection(self.__mapped_config)
+
+        return list()
+
+    def __split_sections(self):
+        """
+        Method to split all the sections of the config, with mmap storage the sections are kept as byte offsets
+        into the file, and no config_tree is built
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __split_sections in class {class_obj}'.format(class_obj=type(self)))
+        for kind in self.section_rules:
+            self.__sections[kind] = dict()
+
+        if self.parse_workers and self.parse_workers > 1 and not (self.shard or self.lazy or self.mmap_storage) \
+                and all('bang' in rule.bangs for rule in self.section_rules.values()):
+            shards = get_config_shards(self.file_name, self.input_dir, self.parse_workers * SHARDS_PER_WORKER)
+            if len(shards) > 1:
+                self.__split_sections_sharded(shards)
+                return
+
+        start_time = time.perf_counter()
+        if self.mmap_storage:
+            self.__mapped_config = mod.scripts.MappedConfig(self.file_name, self.input_dir)
+            self.__walk_config(self.__mapped_config.iter_lines(), self.__store_section)
 
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if standard_community_list_regex.match(match_line):
-                community_list_line_split = match_line.split()
-                community_name = community_list_line_split[3]
-                if community_list_found:
-                    if not self.standard_community_lists.get(community_name):
-                        self.standard_community_lists.update({community_name: list()})
-                    self.standard_community_lists[community_name].append(line)
-                else:
-                    community_list_found = True
-                    self.standard_community_lists.update({community_name: list()})
-                    self.standard_community_lists[community_name].append(line)
-
-            elif bang_regex.match(match_line):
-                community_list_found = False
-
-    def __split_community_sets(self):
-        LOGGER.debug('Starting method __split_community_sets in class {class_obj}'.format(class_obj=type(self)))
-        community_set_begin_regex = re.compile(r'^community-set', re.IGNORECASE)
-        community_set_end_regex = re.compile(r'^end-set', re.IGNORECASE)
-        bang_regex = re.compile(r'^!$')
-        community_set_found = False
-        community_set_name = None
-
-        for line in self.orig_config:
-            match_line = pdt.remove_extra_spaces(line)
-            if community_set_begin_regex.match(match_line):
-                community_set_line_split = match_line.split()
-                community_set_name = community_set_line_split[1]
-                if community_set_found:
-                    if not self.standard_community_lists.get(community_set_name):
-                        self.standard_community_lists.update({community_set_name: list()})
-                    self.standard_community_lists[community_set_name].append(line)
-                else:
-                    community_set_found = True
-                    self.standard_community_lists.update({community_set_name: list()})
-                    self.standard_community_lists[community_set_name].append(line)
-
-            elif bang_regex.match(match_line):
-                community_set_found = False
-
-            elif community_set_end_regex.match(match_line) and community_set_found:
-                self.standard_community_lists[community_set_name].append(line)
-                community_set_found = False
-
-            elif community_set_found:
-                self.standard_community_lists[community_set_name].append(line)
+        else:
+            if self.shard:
+                self.orig_config = read_file_range(self.file_name, self.input_dir, *self.shard)
+
+            else:
+                self.orig_config = list(iter_file_lines(self.file_name, self.input_dir))
+
+            self.stage_times['read'] = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            if not (self.lazy or self.shard):
+                self.config_tree = mod.scripts.ConfigTree()
+            self.__walk_config(((line, line) for line in self.orig_config), self.__store_section, self.config_tree)
+
+        self.stage_times['split'] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        self.__select_platform_sections()
+        self.stage_times['select'] = time.perf_counter() - start_time
+
+    def __split_sections_sharded(self, shards):
+        """
+        Method to split the shards of the config on a pool of processes, and merge the sections in config order,
+        no config_tree, or orig_config is kept
+        :param shards: A list of (start, end) byte offsets, each ending after a ! line
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __split_sections_sharded in class {class_obj}'.format(class_obj=type(self)))
+        start_time = time.perf_counter()
+        shard_args = [(self.file_name, self.input_dir, shard, list(self.section_rules), self.platform)
+                      for shard in shards]
+        with Pool(min(self.parse_workers, len(shards))) as pool:
+            shard_results = pool.map(config_shard_worker, shard_args)
+
+        for hostname, line_count, shard_sections in shard_results:
+            if hostname and not self.hostname:
+                self.hostname = hostname
+
+            self.line_count += line_count
+            for kind in shard_sections:
+                for section_name, section_lines in shard_sections[kind].items():
+                    self.__store_section(self.section_rules[kind], section_name, section_lines)
+
+        self.stage_times['split'] = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        self.__select_platform_sections()
+        self.stage_times['select'] = time.perf_counter() - start_time
+
+    def __split_sections_cached(self):
+        """
+        Method to get the split sections from the parse cache, the config is only parsed on a cache miss.
+        The config_tree, and orig_config are not kept on a cache hit.
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __split_sections_cached in class {class_obj}'.format(class_obj=type(self)))
+        parse_cache = mod.scripts.ParseCache(self.cache_dir)
+        cache_key = parse_cache.make_key(os.path.join(self.input_dir, self.file_name), self.__parser_version())
+        cached_data = parse_cache.get(cache_key)
+        if cached_data:
+            self.hostname = cached_data['hostname']
+            self.line_count = cached_data['line_count']
+            self.__sections = cached_data['sections']
+            self.section_count = sum(len(sections) for sections in self.__sections.values())
+            self.__select_platform_sections()
 
-    def __output_text_files(self):
-        LOGGER.debug('Starting method __output_text_files in class {class_obj}'.format(class_obj=type(self)))
-        self.__split_standard_acls()
-        for key in self.standard_acls:
-            pdt.list_to_file(self.standard_acls[key], 'STANDARD-ACL-{name}.txt'.format(name=key),
-                             os.path.join(self.output_dir, self.hostname))
-
-        self.__split_extended_acls()
-        for key in self.extended_acls:
-            pdt.list_to_file(self.extended_acls[key], 'EXTENDED-ACL-{name}.txt'.format(name=key),
-                             os.path.join(self.output_dir, self.hostname))
-
-        if not self.standard_acls and not self.extended_acls:
-            self.__split_nxos_acls()
-            for key in self.nxos_acls:
-                pdt.list_to_file(self.nxos_acls[key], 'ACL-{name}.txt'.format(name=key),
-                                 os.path.join(self.output_dir, self.hostname))
+        else:
+            self.__split_sections()
+            parse_cache.put(cache_key, {'hostname': self.hostname,
+                                        'line_count': self.line_count,
+                                        'sections': self.__sections})
+
+    def __parser_version(self):
+        return '{version} {sections}'.format(version=get_parser_version(), sections=list(self.section_rules))
+
+    def __select_platform_sections(self):
+        """
+        Method to pick which of the split sections get used, a rule with fallback_for is only used
+        when none of those sections are found, example IOS-XR prefix-sets when there are no prefix-lists
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __select_platform_sections in class {class_obj}'.format(class_obj=type(self)))
+        for rule in self.section_rules.values():
+            if any(self.__sections.get(kind) for kind in rule.fallback_for):
+                continue
+
+            self.__output_sections.append(rule)
+            if rule.attribute:
+                setattr(self, rule.attribute, self.__sections[rule.kind])
+
+        if 'interfaces' in self.section_rules:
+            interfaces = self.__new_section()
+            for section_lines in self.__sections['interfaces'].values():
+                interfaces.append('!')
+                interfaces.extend(section_lines)
+
+            self.interfaces = interfaces
+
+    def load_sections(self, names):
+        """
+        Method to split only the named sections, sections that are already split are not split again,
+        this is how lazy mode fills each attribute on first access
+        :param names: An iterable of section kinds, or attributes example route_maps, hostname is also allowed
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method load_sections in class {class_obj}'.format(class_obj=type(self)))
+        names = set(names)
+        if 'hostname' in names and 'hostname' not in self.__dict__:
+            self.hostname = get_hostname(self.file_name, self.input_dir)
+
+        kinds = set(kind for kind, rule in self.section_rules.items() if kind in names or rule.attribute in names)
+        for kind in list(kinds):
+            kinds.update(fallback_kind for fallback_kind in self.section_rules[kind].fallback_for
+                         if fallback_kind in self.section_rules)
+
+        new_rules = OrderedDict((kind, rule) for kind, rule in self.section_rules.items()
+                                if kind in kinds and kind not in self.__sections)
+        if new_rules:
+            section_rules = self.section_rules
+            self.section_rules = new_rules
+            self.line_count = 0
+            try:
+                self.__split_sections()
+
+            finally:
+                self.section_rules = section_rules
+
+        for name in names:
+            if isinstance(getattr(type(self), name, None), LazySection) and name not in self.__dict__:
+                setattr(self, name, list() if name == 'interfaces' else dict())
+
+    def get_sections(self, all_sections=False):
+        """
+        Method to get the split sections that are used for output
+        :param all_sections: True to also get the sections that were not used because of a fallback
+        :return:
+            A OrderedDict of section kind to a dictionary of section name to the lines of the section
+
+        """
+        if self.lazy:
+            self.load_sections(self.section_rules)
+
+        if all_sections:
+            output_kinds = set(self.__sections)
 
-            if not self.nxos_acls:
-                self.__split_iosxr_acls()
-                for key in self.iosxr_acls:
-                    pdt.list_to_file(self.iosxr_acls[key], 'ACL-{name}.txt'.format(name=key),
-                                     os.path.join(self.output_dir, self.hostname))
-
-        self.__split_interfaces()
-        if self.interfaces:
-            pdt.list_to_file(self.interfaces, 'INTERFACES.txt', os.path.join(self.output_dir, self.hostname))
-
-        self.__split_prefix_lists()
-        for key in self.prefix_lists:
-            pdt.list_to_file(self.prefix_lists[key], 'PREFIX-LIST-{name}.txt'.format(name=key),
-                             os.path.join(self.output_dir, self.hostname))
-
-        if not self.prefix_lists:
-            self.__split_prefix_sets()
-            for key in self.prefix_lists:
-                pdt.list_to_file(self.prefix_lists[key], 'PREFIX-SET-{name}.txt'.format(name=key),
-                                 os.path.join(self.output_dir, self.hostname))
+        else:
+            output_kinds = set(rule.kind for rule in self.__output_sections)
+        sections = OrderedDict()
+        for kind in self.section_rules:
+            if kind in output_kinds:
+                sections[kind] = self.__sections[kind]
+
+        return sections
+
+    def __text_files(self):
+        """
+        Method to get the text file output
+        :return:
+            A OrderedDict of file name to a list of lines
+
+        """
+        text_files = OrderedDict()
+        for rule in self.__output_sections:
+            if rule.kind == 'interfaces':
+                if self.interfaces:
+                    text_files['{prefix}.txt'.format(prefix=rule.file_prefix)] = self.interfaces
+
+            else:
+                for key in self.__sections[rule.kind]:
+                    file_name = '{prefix}{name}.txt'.format(prefix=rule.file_prefix, name=key)
+                    if file_name in text_files:
+                        text_files[file_name] = list(text_files[file_name]) + list(self.__sections[rule.kind][key])
+
+                    else:
+                        text_files[file_name] = self.__sections[rule.kind][key]
+
+        return text_files
+
+    def __spreadsheet_tabs(self):
+        """
+        Method to get the spreadsheet output
+        :return:
+            A dictionary of tab name to a list of lines
+
+        """
+        tabs_dict = dict()
+        for rule in self.__output_sections:
+            if rule.kind == 'interfaces':
+                if self.interfaces:
+                    tabs_dict.update({rule.tab_name: self.interfaces})
 
-        self.__split_route_maps()
-        for key in self.route_maps:
-            pdt.list_to_file(self.route_maps[key], 'ROUTE-MAP-{name}.txt'.format(name=key),
-                             os.path.join(self.output_dir, self.hostname))
+            elif self.__sections[rule.kind]:
+                tab_list = list()
+                for key in self.__sections[rule.kind]:
+                    tab_list.append('!')
+                    tab_list.extend(self.__sections[rule.kind][key])
 
-        if not self.route_maps:
-            self.__split_route_policies()
-            for key in self.route_maps:
-                pdt.list_to_file(self.route_maps[key], 'ROUTE-POLICY-{name}.txt'.format(name=key),
-                                 os.path.join(self.output_dir, self.hostname))
+                tabs_dict.update({rule.tab_name: tab_list})
 
-        self.__split_standard_community_lists()
-        for key in self.standard_community_lists:
-            pdt.list_to_file(self.standard_community_lists[key], 'STANDARD-CL-{name}.txt'.format(name=key),
-                             os.path.join(self.output_dir, self.hostname))
+        return tabs_dict
 
-        if not self.standard_community_lists:
-            self.__split_community_sets()
-            for key in self.standard_community_lists:
-                pdt.list_to_file(self.standard_community_lists[key], 'CS-{name}.txt'.format(name=key),
-                                 os.path.join(self.output_dir, self.hostname))
+    def __output_text_files(self):
+        LOGGER.debug('Starting method __output_text_files in class {class_obj}'.format(class_obj=type(self)))
+        text_files = self.__text_files()
+        for file_name in text_files:
+            pdt.list_to_file(text_files[file_name], file_name, os.path.join(self.output_dir, self.hostname))
 
     def __output_spreadsheet(self, host_name):
         LOGGER.debug('Starting method __output_spreadsheet in class {class_obj}'.format(class_obj=type(self)))
-        temp_list = list()
-        tabs_dict = dict()
-
-        self.__split_standard_acls()
-        if self.standard_acls:
-            for key in self.standard_acls:
-                temp_list.append('!')
-                for line in self.standard_acls[key]:
-                    temp_list.append(line)
-
-            tabs_dict.update({'STANDARD_ACLS': temp_list.copy()})
-            temp_list.clear()
-
-        self.__split_extended_acls()
-        if self.extended_acls:
-            for key in self.extended_acls:
-                temp_list.append('!')
-                for line in self.extended_acls[key]:
-                    temp_list.append(line)
-
-            tabs_dict.update({'EXTENDED_ACLS': temp_list.copy()})
-            temp_list.clear()
-
-        if not self.standard_acls and not self.extended_acls:
-            self.__split_nxos_acls()
-            if self.nxos_acls:
-                for key in self.nxos_acls:
-                    temp_list.append('!')
-                    for line in self.nxos_acls[key]:
-                        temp_list.append(line)
-
-                tabs_dict.update({'NXOS_ACLS': temp_list.copy()})
-                temp_list.clear()
-
-            if not self.nxos_acls:
-                self.__split_iosxr_acls()
-                if self.iosxr_acls:
-                    for key in self.iosxr_acls:
-                        temp_list.append('!')
-                        for line in self.iosxr_acls[key]:
-                            temp_list.append(line)
-
-                    tabs_dict.update({'IOSXR_ACLS': temp_list.copy()})
-                    temp_list.clear()
-
-        self.__split_interfaces()
-        if self.interfaces:
-            tabs_dict.update({'INTERFACES': self.interfaces})
-
-        self.__split_prefix_lists()
-        if self.prefix_lists:
-            for key in self.prefix_lists:
-                temp_list.append('!')
-                for line in self.prefix_lists[key]:
-                    temp_list.append(line)
-
-            tabs_dict.update({'PREFIX_LISTS': temp_list.copy()})
-            temp_list.clear()
-
-        if not self.prefix_lists:
-            self.__split_prefix_sets()
-            if self.prefix_lists:
-                for key in self.prefix_lists:
-                    temp_list.append('!')
-                    for line in self.prefix_lists[key]:
-                        temp_list.append(line)
-
-                tabs_dict.update({'PREFIX_SETS': temp_list.copy()})
-                temp_list.clear()
-
-        self.__split_route_maps()
-        if self.route_maps:
-            for key in self.route_maps:
-                temp_list.append('!')
-                for line in self.route_maps[key]:
-                    temp_list.append(line)
-
-            tabs_dict.update({'ROUTE_MAPS': temp_list.copy()})
-            temp_list.clear()
-
-        if not self.route_maps:
-            self.__split_route_policies()
-            if self.route_maps:
-                for key in self.route_maps:
-                    temp_list.append('!')
-                    for line in self.route_maps[key]:
-                        temp_list.append(line)
-
-                tabs_dict.update({'ROUTE_POLICIES': temp_list.copy()})
-                temp_list.clear()
-
-        self.__split_standard_community_lists()
-        if self.standard_community_lists:
-            for key in self.standard_community_lists:
-                temp_list.append('!')
-                for line in self.standard_community_lists[key]:
-                    temp_list.append(line)
-
-            tabs_dict.update({'STANDARD_COMMUNITY_LISTS': temp_list.copy()})
-            temp_list.clear()
-
-        if not self.standard_community_lists:
-            self.__split_community_sets()
-            if self.standard_community_lists:
-                for key in self.standard_community_lists:
-                    temp_list.append('!')
-                    for line in self.standard_community_lists[key]:
-                        temp_list.append(line)
-
-                tabs_dict.update({'COMMUNITY_SETS': temp_list.copy()})
-                temp_list.clear()
-
         spreadsheet_obj = mod.scripts.WriteXlsxTabs(os.path.join(self.output_dir, host_name,
                                                                  '{host_name}.xlsx'.format(host_name=host_name)),
-                                                    **tabs_dict)
+                                                    **self.__spreadsheet_tabs())
         spreadsheet_obj.write_spreadsheet()
 
-    def __split_config(self):
-        LOGGER.debug('Starting method __split_config in class {class_obj}'.format(class_obj=type(self)))
+    def __manifest_path(self):
+        return os.path.join(self.output_dir, self.hostname, MANIFEST_FILE_NAME)
+
+    def __load_manifest(self):
+        """
+        Method to load the manifest of the previous split of this host
+        :return:
+            A dictionary, empty if there was no previous split
+
+        """
+        try:
+            with open(self.__manifest_path(), 'r') as manifest_file:
+                return json.load(manifest_file)
+
+        except (FileNotFoundError, ValueError):
+            return dict()
+
+    def __save_manifest(self):
+        with open(self.__manifest_path(), 'w') as manifest_file:
+            json.dump(self.__manifest, manifest_file, indent=1, sort_keys=True)
+
+    def __output_mode(self):
+        return 'text' if self.output_text_files else 'xlsx'
+
+    def __previous_split_unchanged(self):
+        """
+        Method to check the config against the manifest of the previous split
+        :return:
+            True if the config, and parser are the same as the previous split
+
+        """
+        LOGGER.debug('Starting method __previous_split_unchanged in class {class_obj}'.format(class_obj=type(self)))
+        self.hostname = get_hostname(self.file_name, self.input_dir)
+        self.__verify_host_directory()
+        self.__manifest = self.__load_manifest()
+        self.__file_hash = mod.scripts.ParseCache.make_key(os.path.join(self.input_dir, self.file_name),
+                                                            self.__parser_version())
+        return self.__manifest.get(self.__output_mode(), dict()).get('file_hash') == self.__file_hash
+
+    def __output_text_files_incremental(self):
+        """
+        Method to only rewrite the text files that changed since the previous split, and remove the text files
+        of sections that no longer exist
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __output_text_files_incremental in class '
+                     '{class_obj}'.format(class_obj=type(self)))
+        host_dir = os.path.join(self.output_dir, self.hostname)
+        previous_digests = self.__manifest.get('text', dict()).get('outputs', dict())
+        digests = dict()
+        text_files = self.__text_files()
+        for file_name in text_files:
+            digests[file_name] = get_lines_digest(text_files[file_name])
+            file_path = os.path.join(host_dir, file_name)
+            if previous_digests.get(file_name) != digests[file_name] or not os.path.exists(file_path):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                pdt.list_to_file(text_files[file_name], file_name, host_dir)
+                self.changed_outputs.append(file_name)
+
+        for file_name in previous_digests:
+            if file_name in digests:
+                continue
+
+            if not any(file_name.startswith(rule.file_prefix) for rule in self.section_rules.values()):
+                digests[file_name] = previous_digests[file_name]
+                continue
+
+            file_path = os.path.join(host_dir, file_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            self.changed_outputs.append(file_name)
+
+        self.__manifest['text'] = {'file_hash': self.__file_hash, 'outputs': digests}
+        self.__save_manifest()
+
+    def __output_spreadsheet_incremental(self):
+        """
+        Method to rewrite the spreadsheet only when one of its tabs changed since the previous split,
+        the workbook can not be edited in place so it is written whole
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __output_spreadsheet_incremental in class '
+                     '{class_obj}'.format(class_obj=type(self)))
+        previous_digests = self.__manifest.get('xlsx', dict()).get('outputs', dict())
+        digests = dict()
+        tabs_dict = self.__spreadsheet_tabs()
+        for tab_name in tabs_dict:
+            digests[tab_name] = get_lines_digest(tabs_dict[tab_name])
+            if previous_digests.get(tab_name) != digests[tab_name]:
+                self.changed_outputs.append(tab_name)
+
+        for tab_name in previous_digests:
+            if tab_name not in digests:
+                self.changed_outputs.append(tab_name)
+
+        spreadsheet_path = os.path.join(self.output_dir, self.hostname,
+                                        '{host_name}.xlsx'.format(host_name=self.hostname))
+        if self.changed_outputs or not os.path.exists(spreadsheet_path):
+            spreadsheet_obj = mod.scripts.WriteXlsxTabs(spreadsheet_path, **tabs_dict)
+            spreadsheet_obj.write_spreadsheet()
+
+        self.__manifest['xlsx'] = {'file_hash': self.__file_hash, 'outputs': digests}
+        self.__save_manifest()
+
+    def __verify_host_directory(self):
+        LOGGER.debug('Starting method __verify_host_directory in class {class_obj}'.format(class_obj=type(self)))
         if self.hostname:
             pdt.verify_directory(self.hostname, self.output_dir, directory_create=True)
         else:
             self.hostname = 'NONE'
             pdt.verify_directory('NONE', self.output_dir, directory_create=True)
 
+    def __stream_section(self, rule, section_name, section_lines):
+        """
+        Method to send a finished section straight to its text file, or tab
+        :param rule: The SectionRule of the section
+        :param section_name: The name of the section
+        :param section_lines: A list of the lines in the section
+        :return:
+            None
+
+        """
+        self.section_count += 1
         if self.output_text_files:
+            if rule.kind == 'interfaces':
+                pdt.list_to_file(['!'] + section_lines, '{prefix}.txt'.format(prefix=rule.file_prefix),
+                                 os.path.join(self.output_dir, self.hostname))
+
+            else:
+                pdt.list_to_file(section_lines, '{prefix}{name}.txt'.format(prefix=rule.file_prefix,
+                                                                            name=section_name),
+                                 os.path.join(self.output_dir, self.hostname))
+
+        else:
+            self.__spreadsheet_obj.write_section(rule.tab_name, ['!'] + section_lines)
+
+    def __stream_config(self):
+        """
+        Method to read the config as a line iterator, and output each section as soon as it is finished,
+        so only the open sections are held in memory
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method __stream_config in class {class_obj}'.format(class_obj=type(self)))
+        start_time = time.perf_counter()
+        self.hostname = get_hostname(self.file_name, self.input_dir)
+        self.__verify_host_directory()
+        if not self.output_text_files:
+            self.__spreadsheet_obj = mod.scripts.WriteXlsxStreamTabs(
+                os.path.join(self.output_dir, self.hostname, '{host_name}.xlsx'.format(host_name=self.hostname)))
+
+        self.__walk_config(((line, line) for line in iter_file_lines(self.file_name, self.input_dir)),
+                           self.__stream_section)
+
+        if self.__spreadsheet_obj:
+            self.__spreadsheet_obj.write_spreadsheet()
+
+        self.stage_times['stream'] = time.perf_counter() - start_time
+
+    def __split_config(self):
+        LOGGER.debug('Starting method __split_config in class {class_obj}'.format(class_obj=type(self)))
+        start_time = time.perf_counter()
+        self.__verify_host_directory()
+
+        if self.incremental:
+            if self.output_text_files:
+                self.__output_text_files_incremental()
+
+            else:
+                self.__output_spreadsheet_incremental()
+
+        elif self.output_text_files:
             self.__output_text_files()
 
         else:
             self.__output_spreadsheet(self.hostname)
+
+        self.stage_times['output_text' if self.output_text_files else 'output_xlsx'] = time.perf_counter() - start_time
+
+
+def get_section_name(match_line, name_index):
+    """
+    Function to get the name of a section from its first line
+    :param match_line: The line with extra spaces removed
+    :param name_index: The index of the name in the split line, -1 for the last word example object-group ip address
+                       NAME on NX-OS, and object-group network ipv4 NAME on IOS-XR
+    :return:
+        The section name
+
+    """
+    match_line_split = match_line.split()
+    if len(match_line_split) > name_index:
+        return match_line_split[name_index]
+
+    return match_line
+
+
+def get_lines_digest(lines):
+    """
+    Function to get a digest of a list of lines
+    :param lines: A list of lines
+    :return:
+        A hex digest
+
+    """
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+def get_parser_version():
+    """
+    Function to get a version string for the parser, it changes when the module version, or the registry changes
+    :return:
+        A string
+
+    """
+    return '{version} {rules} {line_classes}'.format(version=__version__, rules=SECTION_RULES,
+                                                     line_classes=LINE_CLASSES)
+
+
+def iter_file_lines(file_name, file_location):
+    """
+    Function to read a text file one line at a time
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :return:
+        A generator of the lines, without line breaks
+
+    """
+    with open(os.path.join(file_location, file_name), 'r', newline='\n') as config_file:
+        for line in config_file:
+            yield line.rstrip('\r\n')
+
+
+def read_file_range(file_name, file_location, start, end):
+    """
+    Function to read a byte range of a text file
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :param start: The start offset, at the start of a line
+    :param end: The end offset, at the end of a line
+    :return:
+        A list of the lines, without line breaks
+
+    """
+    with open(os.path.join(file_location, file_name), 'rb') as config_file:
+        config_file.seek(start)
+        return split_config_lines(config_file.read(end - start).decode('utf-8', 'replace'))
+
+
+def split_config_lines(config_text):
+    """
+    Function to split config text into lines the same as iter_file_lines, only on new lines, splitlines() also splits
+    on characters example form feed that can be in a line of a config
+    :param config_text: The config text
+    :return:
+        A list of the lines, without line breaks
+
+    """
+    lines = config_text.split('\n')
+    if not lines[-1]:
+        lines.pop()
+
+    return [line.rstrip('\r') for line in lines]
+
+
+def get_config_shards(file_name, file_location, shard_count, min_shard_size=MIN_SHARD_SIZE):
+    """
+    Function to cut a config into shards that can be split on their own, each shard ends after a ! line
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :param shard_count: The number of shards wanted
+    :param min_shard_size: The smallest shard in bytes, small configs are not cut
+    :return:
+        A list of (start, end) byte offsets
+
+    """
+    LOGGER.debug('Starting Function get_config_shards')
+    file_size = os.path.getsize(os.path.join(file_location, file_name))
+    shard_count = min(shard_count, file_size // min_shard_size)
+    boundaries = [0]
+    with open(os.path.join(file_location, file_name), 'rb') as config_file:
+        for shard_number in range(1, shard_count):
+            config_file.seek(max(file_size * shard_number // shard_count, boundaries[-1]))
+            config_file.readline()
+            for line in iter(config_file.readline, b''):
+                if SHARD_BOUNDARY_REGEX.match(line):
+                    break
+
+            boundary = config_file.tell()
+            if boundary >= file_size:
+                break
+
+            boundaries.append(boundary)
+
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def config_shard_worker(shard_args):
+    """
+    Function to split one shard of a config in a worker process
+    :param shard_args: A tuple of file name, input directory, (start, end) byte offsets, section kinds, and platform
+    :return:
+        A tuple of hostname, line count, and a dictionary of every section kind split
+
+    """
+    file_name, input_dir, shard, sections, platform = shard_args
+    splitter = ConfigSplitter(file_name, input_dir, sections=sections, platform=platform or 'all',
+                              write_output=False, shard=shard)
+    return splitter.hostname, splitter.line_count, splitter.get_sections(all_sections=True)
+
+
+def get_hostname(file_name, file_location):
+    """
+    Function to find the hostname in a config, stops reading at the hostname line
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :return:
+        The hostname, or None
+
+    """
+    for line in iter_file_lines(file_name, file_location):
+        match_line = pdt.remove_extra_spaces(line)
+        line_match = SECTION_CLASSIFIER.match(match_line)
+        if line_match and line_match.lastgroup == 'hostname':
+            return match_line.split()[1]
+
+    return None
+
+
+def get_config_file_paths(file_pattern, input_dir):
+    """
+    Function to find the config files for a folder, or glob
+    :param file_pattern: A folder name, or a glob pattern in the input directory
+    :param input_dir: The input directory
+    :return:
+        A sorted list of file paths
+
+    """
+    pattern_path = os.path.join(input_dir, file_pattern)
+    if os.path.isdir(pattern_path):
+        pattern_path = os.path.join(pattern_path, '*')
+
+    file_paths = sorted(path for path in glob.glob(pattern_path) if os.path.isfile(path))
+    if not file_paths:
+        LOGGER.critical('No config files found for {file_pattern}'.format(file_pattern=file_pattern))
+        raise ValueError('No config files found for {file_pattern}'.format(file_pattern=file_pattern))
+
+    return file_paths
+
+
+def config_split_worker(split_args):
+    """
+    Function to split one config in a worker process
+    :param split_args: A tuple of file path, output directory, output text files, stream, cache directory,
+                       incremental, mmap storage, sections, and platform
+    :return:
+        A tuple of file path, hostname, line count, section count, and error message or None
+
+    """
+    (file_path, output_dir, output_text_files, stream, cache_dir, incremental, mmap_storage, sections,
+     platform) = split_args
+    try:
+        splitter = ConfigSplitter(os.path.basename(file_path), os.path.dirname(file_path), output_dir,
+                                  output_text_files, stream, cache_dir, incremental, mmap_storage, sections, platform)
+        return file_path, splitter.hostname, splitter.line_count, splitter.section_count, None
+
+    except Exception as e:
+        LOGGER.error('Failed to split {file_path} {error}'.format(file_path=file_path, error=e))
+        return file_path, None, 0, 0, str(e)
+
+
+def config_split_batch(file_pattern, input_dir, output_dir, output_text_files=False, stream=False, workers=None,
+                       cache_dir=None, incremental=False, mmap_storage=False, sections=None, platform='auto'):
+    """
+    Function to split a folder, or glob of configs across a pool of processes
+    :param file_pattern: A folder name, or a glob pattern in the input directory
+    :param input_dir: The input directory
+    :param output_dir: The output directory
+    :param output_text_files: Output text files instead of Excel
+    :param stream: Use the streaming splitter
+    :param workers: The number of worker processes, defaults to the number of CPUs
+    :param cache_dir: The parse cache directory, None to not use the cache
+    :param incremental: Only rewrite the output that changed since the previous split
+    :param mmap_storage: Keep the sections as byte offsets into the memory mapped file
+    :param sections: An iterable of the section names to parse, None for all sections
+    :param platform: auto to detect the platform of each config, all for every platform, or ios, nxos, iosxr
+    :return:
+        A list of the worker results
+
+    """
+    LOGGER.debug('Starting Function config_split_batch')
+    get_section_rules(sections)
+    file_paths = get_config_file_paths(file_pattern, input_dir)
+    start_time = time.time()
+    split_args = [(file_path, output_dir, output_text_files, stream, cache_dir, incremental, mmap_storage, sections,
+                   platform) for file_path in file_paths]
+    with Pool(workers) as pool:
+        results = list(pool.imap_unordered(config_split_worker, split_args, chunksize=4))
+
+    elapsed = time.time() - start_time
+    failed = [result for result in results if result[4]]
+    total_lines = sum(result[2] for result in results)
+    total_sections = sum(result[3] for result in results)
+
+    print('Split {good} of {total} configs in {elapsed:.1f} seconds'.format(good=len(results) - len(failed),
+                                                                         total=len(results), elapsed=elapsed))
+    print('Lines read: {lines}  Sections found: {sections}'.format(lines=total_lines, sections=total_sections))
+    for result in failed:
+        print('Failed: {file_path} {error}'.format(file_path=result[0], error=result[4]))
+
+    return results
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import logging
+import re
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 1, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+BLOCK_TERMINATOR_REGEX = re.compile(r'^\s*(end-set|end-policy|end-group)\s*$', re.IGNORECASE)
+BANG_REGEX = re.compile(r'^\s*!')
+
+
+class ConfigNode:
+    """
+    Class for one line of a config, and the lines nested under it
+    """
+    __slots__ = ('line', 'line_number', 'indent', 'parent', 'children', 'kind', 'name')
+
+    def __init__(self, line, line_number, indent, parent=None, kind=None, name=None):
+        self.line = line
+        self.line_number = line_number
+        self.indent = indent
+        self.parent = parent
+        self.children = list()
+        self.kind = kind
+        self.name = name
+
+    def __repr__(self):
+        return '<ConfigNode {line_number}: {line}>'.format(line_number=self.line_number, line=self.line)
+
+    def get_lines(self):
+        """
+        Method to get the line, and all the lines nested under it in config order
+        :return:
+            A list of lines
+
+        """
+        lines = list()
+        node_stack = [self]
+        while node_stack:
+            node = node_stack.pop()
+            if node.line is not None:
+                lines.append(node.line)
+            node_stack.extend(reversed(node.children))
+
+        return lines
+
+
+class ConfigTree:
+    """
+    Class to build a tree of a config from the indentation, and block terminators of each line, top level
+    blocks can be tagged with a section kind, and name for lookups
+    """
+    def __init__(self):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.root = ConfigNode(None, None, -1)
+        self.section_index = dict()
+        self.__node_stack = [self.root]
+        self.__line_number = 0
+
+    def add_line(self, line, kind=None, name=None):
+        """
+        Method to add the next line of the config to the tree
+        :param line: The config line
+        :param kind: The section kind if the line begins a section, only lines in column 0 are indexed
+        :param name: The section name if the line begins a section
+        :return:
+            The ConfigNode created, or None if the line is not kept
+
+        """
+        line_number = self.__line_number
+        self.__line_number += 1
+        stripped_line = line.lstrip()
+        if not stripped_line:
+            return None
+
+        indent = len(line) - len(stripped_line)
+        if BANG_REGEX.match(line):
+            while self.__node_stack[-1].indent >= indent:
+                self.__node_stack.pop()
+            return None
+
+        if BLOCK_TERMINATOR_REGEX.match(line):
+            while len(self.__node_stack) > 2:
+                self.__node_stack.pop()
+            node = ConfigNode(line, line_number, indent, self.__node_stack[-1])
+            self.__node_stack[-1].children.append(node)
+            del self.__node_stack[1:]
+            return node
+
+        while self.__node_stack[-1].indent >= indent:
+            self.__node_stack.pop()
+
+        node = ConfigNode(line, line_number, indent, self.__node_stack[-1], kind, name)
+        self.__node_stack[-1].children.append(node)
+        self.__node_stack.append(node)
+
+        if kind and not indent:
+            self.section_index.setdefault(kind, dict()).setdefault(name, list()).append(node)
+
+        return node
+
+    def get_section(self, kind, name):
+        """
+        Method to get the blocks of a section
+        :param kind: The section kind example prefix_lists
+        :param name: The section name
+        :return:
+            A list of ConfigNode, an empty list if the section does not exist
+
+        """
+        return self.section_index.get(kind, dict()).get(name, list())
+
+    def get_section_lines(self, kind, name):
+        """
+        Method to get the lines of a section
+        :param kind: The section kind example prefix_lists
+        :param name: The section name
+        :return:
+            A list of lines
+
+        """
+        lines = list()
+        for node in self.get_section(kind, name):
+            lines.extend(node.get_lines())
+
+        return lines
+
+    def get_sections(self, kind):
+        """
+        Method to get all the sections of a kind
+        :param kind: The section kind example route_maps
+        :return:
+            A dictionary of section name to a list of ConfigNode
+
+        """
+        return self.section_index.get(kind, dict())
+
+    def get_top_level(self, line_regex):
+        """
+        Method to find top level blocks that are not indexed by kind
+        :param line_regex: A compiled regex to match the first line of the block
+        :return:
+            A list of ConfigNode
+
+        """
+        return [node for node in self.root.children if line_regex.match(node.line)]
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import logging
+import socket
+from collections import namedtuple
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 2, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+# side is A, or B, the side the entry is on, and missing from the other side, line_index is the index of the
+# line in the original list, shared by the prefix-list, and ACL differs
+DiffRecord = namedtuple('DiffRecord', ['side', 'action', 'prefix', 'line_index'])
+
+
+class ListEntry:
+    """
+    Class for one permit, or deny entry of a prefix-list, or ACL, the address is kept as an integer, and the
+    original text is only kept in the list of original lines, line_index is the index of the line in that list
+    """
+    __slots__ = ('action', 'network', 'length', 'ge', 'le', 'sequence', 'line_index', 'max_length', 'wildcard')
+
+    def __init__(self, action, network, length, ge=None, le=None, sequence=None, line_index=None, max_length=32,
+                 wildcard=None):
+        self.action = action
+        self.network = network
+        self.length = length
+        self.ge = ge
+        self.le = le
+        self.sequence = sequence
+        self.line_index = line_index
+        self.max_length = max_length
+        self.wildcard = wildcard
+
+    def get_match_key(self):
+        """
+        Method to get the key two entries match on, the sequence number, and line are not part of it
+        :return:
+            A tuple of the action, and integers
+
+        """
+        return self.action, self.max_length, self.network, self.length, self.wildcard, self.ge, self.le
+
+    def get_prefix_text(self):
+        """
+        Method to get the prefix as text
+        :return:
+            A string example 10.0.0.0/8
+
+        """
+        return '{address}/{length}'.format(address=get_address_text(self.network, self.max_length),
+                                           length=self.length)
+
+
+def get_address_value(address):
+    """
+    Function to convert an IPv4, or IPv6 address to an integer
+    :param address: The address example 10.0.0.0
+    :return:
+        A tuple of the address as an integer, and 32 or 128
+
+    """
+    try:
+        if ':' in address:
+            return int.from_bytes(socket.inet_pton(socket.AF_INET6, address), 'big'), 128
+
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address), 'big'), 32
+
+    except OSError:
+        # Callers treat this as a line that is not an entry, so it is not logged as an error
+        LOGGER.debug('{address} is not an IP address'.format(address=address))
+        raise ValueError('{address} is not an IP address'.format(address=address))
+
+
+def get_address_text(value, max_length=32):
+    """
+    Function to convert an integer to an IPv4, or IPv6 address
+    :param value: The address as an integer
+    :param max_length: 32 for IPv4, or 128 for IPv6
+    :return:
+        A string example 10.0.0.0
+
+    """
+    if max_length == 32:
+        return socket.inet_ntop(socket.AF_INET, value.to_bytes(4, 'big'))
+
+    return socket.inet_ntop(socket.AF_INET6, value.to_bytes(16, 'big'))
+
+
+def get_wildcard_length(wildcard, max_length=32):
+    """
+    Function to get the prefix length of a wildcard mask
+    :param wildcard: The wildcard mask as an integer example 255 for 0.0.0.255
+    :param max_length: 32 for IPv4, or 128 for IPv6
+    :return:
+        The prefix length, or None if the wildcard mask is not contiguous
+
+    """
+    if wildcard & (wildcard + 1):
+        return None
+
+    return max_length - wildcard.bit_length()
+
+
+def make_prefix_list_entry(entry_tuple, line_index=None):
+    """
+    Function to make a ListEntry from a pulled apart prefix-list line
+    :param entry_tuple: A tuple of sequence number or None, action, prefix, ge or None, and le or None
+    :param line_index: The index of the line in the original list
+    :return:
+        A ListEntry, or None if the prefix is not a valid prefix
+
+    """
+    sequence, action, prefix, greater_equal, less_equal = entry_tuple
+    address, _, length = prefix.partition('/')
+    try:
+        network, max_length = get_address_value(address)
+
+    except ValueError:
+        return None
+
+    if not length.isdigit() or int(length) > max_length:
+        return None
+
+    return ListEntry(action, network, int(length), greater_equal, less_equal, sequence, line_index, max_length)
+
+
+def make_access_list_entry(line_split, line_index=None):
+    """
+    Function to make a ListEntry from a split standard ACL line
+    :param line_split: The split line example ['permit', '10.0.0.0', '0.0.0.255']
+    :param line_index: The index of the line in the original list
+    :return:
+        A ListEntry, or None if the line is not a permit, or deny entry
+
+    """
+    if len(line_split) not in (2, 3) or line_split[0] not in ('permit', 'deny'):
+        return None
+
+    try:
+        if line_split[1] == 'any' and len(line_split) == 2:
+            network, wildcard = 0, 0xffffffff
+
+        elif line_split[1] == 'host' and len(line_split) == 3:
+            network, wildcard = get_address_value(line_split[2])[0], 0
+
+        elif len(line_split) == 3:
+            network, wildcard = get_address_value(line_split[1])[0], get_address_value(line_split[2])[0]
+
+        else:
+            network, wildcard = get_address_value(line_split[1])[0], 0
+
+    except ValueError:
+        return None
+
+    return ListEntry(line_split[0], network, get_wildcard_length(wildcard), line_index=line_index,
+                     wildcard=wildcard)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import logging
+import mmap
+import os
+import module as mod
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 1, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MappedConfig:
+    """
+    Class to memory map a config file, so sections can be kept as byte offsets instead of copies of the lines,
+    the file is closed once it is mapped, and the map is closed with close(), or at the end of a with block
+    """
+    def __init__(self, file_name, file_location, encoding='utf-8'):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.file_path = os.path.join(file_location, file_name)
+        self.encoding = encoding
+        self.config_map = None
+        with open(self.file_path, 'rb') as config_file:
+            if os.fstat(config_file.fileno()).st_size:
+                self.config_map = mmap.mmap(config_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def iter_lines(self):
+        """
+        Method to read the mapped file one line at a time
+        :return:
+            A generator of tuples of the decoded line, and the (start, end) offsets of the line
+
+        """
+        if not self.config_map:
+            return
+
+        config_map = self.config_map
+        map_size = len(config_map)
+        start = 0
+        while start < map_size:
+            end = config_map.find(b'\n', start)
+            end = map_size if end == -1 else end + 1
+            yield config_map[start:end].rstrip(b'\r\n').decode(self.encoding, 'replace'), (start, end)
+            start = end
+
+    def decode(self, start, end):
+        """
+        Method to decode a range of the mapped file into lines
+        :param start: The start offset
+        :param end: The end offset
+        :return:
+            A list of lines
+
+        """
+        if self.config_map is None:
+            LOGGER.critical('{file_path} is not mapped, it is empty, or closed'.format(file_path=self.file_path))
+            raise ValueError('{file_path} is not mapped, it is empty, or closed'.format(file_path=self.file_path))
+
+        return mod.scripts.config_spliter.split_config_lines(
+            self.config_map[start:end].decode(self.encoding, 'replace'))
+
+    def close(self):
+        """
+        Method to close the memory map, sections of this config can not be read after it is closed
+        :return:
+            None
+
+        """
+        if self.config_map:
+            self.config_map.close()
+            self.config_map = None
+
+
+class MappedSection:
+    """
+    Class for a section of a MappedConfig, kept as ranges of byte offsets, lines are only decoded when iterated.
+    Plain string lines can be added for lines that are not in the file.
+    """
+    __slots__ = ('mapped_config', 'items', 'line_count')
+
+    def __init__(self, mapped_config):
+        self.mapped_config = mapped_config
+        self.items = list()
+        self.line_count = 0
+
+    def append(self, line_item):
+        """
+        Method to add a line
+        :param line_item: A (start, end) offset tuple, or a string
+        :return:
+            None
+
+        """
+        self.line_count += 1
+        if isinstance(line_item, str):
+            self.items.append(line_item)
+
+        elif self.items and not isinstance(self.items[-1], str) and self.items[-1][1] == line_item[0]:
+            self.items[-1] = (self.items[-1][0], line_item[1])
+
+        else:
+            self.items.append(line_item)
+
+    def extend(self, line_items):
+        if isinstance(line_items, MappedSection):
+            self.items.extend(line_items.items)
+            self.line_count += line_items.line_count
+
+        else:
+            for line_item in line_items:
+                self.append(line_item)
+
+    def __iter__(self):
+        for line_item in self.items:
+            if isinstance(line_item, str):
+                yield line_item
+
+            else:
+                for line in self.mapped_config.decode(*line_item):
+                    yield line
+
+    def __len__(self):
+        return self.line_count
+
+    def __reduce__(self):
+        return list, (list(self),)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import logging
+import hashlib
+import os
+import pickle
+import tempfile
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 0, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_FILE_EXTENSION = '.pickle'
+
+
+class ParseCache:
+    """
+    Class for a size bounded on disk cache of parsed configs, keyed by a hash of the file, and the parser version.
+    The least recently used entries are removed when the cache is over its size.
+    """
+    def __init__(self, cache_dir, max_size_mb=512):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __cache_path(self, key):
+        return os.path.join(self.cache_dir, '{key}{extension}'.format(key=key, extension=CACHE_FILE_EXTENSION))
+
+    def __list_entries(self):
+        """
+        Method to list the cache entries
+        :return:
+            A list of tuples of last used time, size, and path, oldest first
+
+        """
+        entries = list()
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(CACHE_FILE_EXTENSION):
+                file_path = os.path.join(self.cache_dir, file_name)
+                try:
+                    file_stat = os.stat(file_path)
+                    entries.append((file_stat.st_mtime, file_stat.st_size, file_path))
+
+                except FileNotFoundError:
+                    continue
+
+        entries.sort()
+        return entries
+
+    @staticmethod
+    def make_key(file_path, parser_version):
+        """
+        Method to make a cache key from a file
+        :param file_path: The path to the file
+        :param parser_version: A string that changes when the parser output changes
+        :return:
+            A hex digest
+
+        """
+        file_hash = hashlib.sha256()
+        file_hash.update(parser_version.encode('utf-8'))
+        with open(file_path, 'rb') as hash_file:
+            for chunk in iter(lambda: hash_file.read(1024 * 1024), b''):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def get(self, key):
+        """
+        Method to get a cache entry, and mark it as recently used
+        :param key: The cache key
+        :return:
+            The cached data, or None on a miss
+
+        """
+        cache_path = self.__cache_path(key)
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                data = pickle.load(cache_file)
+            os.utime(cache_path, None)
+            LOGGER.debug('Cache hit {key}'.format(key=key))
+            return data
+
+        except FileNotFoundError:
+            LOGGER.debug('Cache miss {key}'.format(key=key))
+            return None
+
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            LOGGER.warning('Removing bad cache entry {key} {error}'.format(key=key, error=e))
+            self.__remove(cache_path)
+            return None
+
+    def put(self, key, data):
+        """
+        Method to store a cache entry, then evict the least recently used entries if over the size
+        :param key: The cache key
+        :param data: The data to pickle
+        :return:
+            None
+
+        """
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(temp_fd, 'wb') as temp_file:
+            pickle.dump(data, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, self.__cache_path(key))
+        self.evict()
+
+    def evict(self):
+        """
+        Method to remove the least recently used entries until the cache is under its size
+        :return:
+            None
+
+        """
+        entries = self.__list_entries()
+        total_size = sum(entry[1] for entry in entries)
+        for last_used, size, file_path in entries:
+            if total_size <= self.max_size:
+                break
+
+            LOGGER.debug('Evicting cache entry {file_path}'.format(file_path=file_path))
+            self.__remove(file_path)
+            total_size -= size
+
+    def clear(self):
+        """
+        Method to remove all the cache entries
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method clear in class {class_obj}'.format(class_obj=type(self)))
+        for last_used, size, file_path in self.__list_entries():
+            self.__remove(file_path)
+
+    @staticmethod
+    def __remove(file_path):
+        try:
+            os.remove(file_path)
+
+        except FileNotFoundError:
+            pass
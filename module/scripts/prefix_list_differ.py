@@ -1,11 +1,16 @@
 import logging
+import os
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from itertools import chain
 import persistentdatatools as pdt
+import module as mod
 __author__ = 'Benjamin P. Trachtenberg'
 __copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
 __credits__ = 'Benjamin P. Trachtenberg'
 __license__ = ''
 __status__ = 'prod'
-__version_info__ = (1, 0, 2, __status__)
+__version_info__ = (1, 0, 19, __status__)
 __version__ = '.'.join(map(str, __version_info__))
 __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
@@ -26,60 +31,33 @@ class PrefixListInformation:
             LOGGER.critical('Expected a list but received a {item_type}'.format(item_type=type(prefix_list_original)))
             raise TypeError('Expected a list but received a {item_type}'.format(item_type=type(prefix_list_original)))
 
-        self.prefix_list_permit_deny_dict = {'permit': list(),
-                                             'deny': list()}
-        self.prefix_list_permit_statement_matcher = list()
-        self.prefix_list_deny_statement_matcher = list()
-        self.prefix_list_parts_list = list()
+        self.prefix_list_entries = list()
+        self.prefix_list_names = list()
         self.comparison = None
         self._compile_prefix_list()
 
-    def _create_prefix_list_permit_deny_dict(self):
+    def _create_prefix_list_entries(self):
         """
-        Method to create a permit or deny dictionary
+        Method to create the list of entries, the prefixes are kept as integers, and the line index where each
+        prefix-list name starts is kept for the names of the entries
 
         :return:
             None
 
         """
-        LOGGER.debug('Starting Method _create_prefix_list_permit_deny_dict in Class '
+        LOGGER.debug('Starting Method _create_prefix_list_entries in Class '
                      '{class_type}'.format(class_type=type(self)))
 
-        for index, line in enumerate(self.prefix_list_original):
-            line_split = line.split()
-            self.prefix_list_parts_list.append(line_split)
-            if len(line_split) == 9:
-                if line_split[5] == 'permit':
-                    self.prefix_list_permit_deny_dict['permit'].append((index, ' '.join(line_split[6:9])))
-
-                elif line_split[5] == 'deny':
-                    self.prefix_list_permit_deny_dict['deny'].append((index, ' '.join(line_split[6:9])))
-
-            elif len(line_split) == 7:
-                if line_split[5] == 'permit':
-                    self.prefix_list_permit_deny_dict['permit'].append((index, line_split[6]))
-
-                elif line_split[5] == 'deny':
-                    self.prefix_list_permit_deny_dict['deny'].append((index, line_split[6]))
+        for index, pl_name, entry_tuple in iter_prefix_list_entries(self.prefix_list_original):
+            entry = mod.scripts.list_entry.make_prefix_list_entry(entry_tuple, index)
+            if entry:
+                self.prefix_list_entries.append(entry)
+                if not self.prefix_list_names or self.prefix_list_names[-1][1] != pl_name:
+                    self.prefix_list_names.append((index, pl_name))
 
             else:
-                LOGGER.warning('Line {index}, did not match a need length {line}'.format(index=index, line=line_split))
-
-    def _create_match_lists(self):
-        """
-        Method to create a list from the tuples in orig_list
-
-        :return:
-            None
-
-        """
-        LOGGER.debug('Starting Method _create_match_lists in Class {class_type}'.format(class_type=type(self)))
-
-        for orig_tuple in self.prefix_list_permit_deny_dict['permit']:
-            self.prefix_list_permit_statement_matcher.append(orig_tuple[1])
-
-        for orig_tuple in self.prefix_list_permit_deny_dict['deny']:
-            self.prefix_list_deny_statement_matcher.append(orig_tuple[1])
+                LOGGER.warning('Line {index}, is not a valid prefix {prefix}'.format(index=index,
+                                                                                     prefix=entry_tuple[2]))
 
     def _compile_prefix_list(self):
         """
@@ -90,12 +68,12 @@ class PrefixListInformation:
 
         """
         LOGGER.debug('Starting Method _compile_prefix_list in Class {class_type}'.format(class_type=type(self)))
-        self._create_prefix_list_permit_deny_dict()
-        self._create_match_lists()
+        self._create_prefix_list_entries()
 
     def compare_prefix_list(self, pl_object, input_file_name):
         """
-        Method to compare another prefix-list object
+        Method to compare another prefix-list object, each entry uses up one matching entry of the other
+        prefix-list, so an entry in this prefix-list more times than in the other is reported
         :param pl_object: The comparison object
         :param input_file_name: The source file name
         :return:
@@ -116,41 +94,171 @@ class PrefixListInformation:
             LOGGER.critical('Tried to run a comparison, when one has already been run!')
             raise FileExistsError('A comparison is already being stored')
 
-        comparison_permit_list = pl_object.get_prefix_list_permit_statement_matcher()
-        comparison_deny_list = pl_object.get_prefix_list_deny_statement_matcher()
-
-        for key in self.prefix_list_permit_deny_dict:
-            for line in self.prefix_list_permit_deny_dict[key]:
-                if key == 'permit':
-                    if line[1] not in comparison_permit_list:
-                        self.comparison.append(
-                            '{permit_deny} {ip_addr} not in prefix-list {pl_name} in file '
-                            '{input_file_name}'.format(permit_deny=key,
-                                                       ip_addr=line[1],
-                                                       pl_name=self.prefix_list_parts_list[line[0]][2],
-                                                       input_file_name=input_file_name))
-                        self.comparison.append(self.prefix_list_original[line[0]])
-
-                elif key == 'deny':
-                    if line[1] not in comparison_deny_list:
-                        self.comparison.append(
-                            '{permit_deny} {ip_addr} not in prefix-list {pl_name} in file '
-                            '{input_file_name}'.format(permit_deny=key,
-                                                       ip_addr=line[1],
-                                                       pl_name=self.prefix_list_parts_list[line[0]][2],
-                                                       input_file_name=input_file_name))
-                        self.comparison.append(self.prefix_list_original[line[0]])
+        for diff_record in get_prefix_list_missing(self, pl_object, 'A'):
+            self.comparison.append(
+                '{permit_deny} {ip_addr} not in prefix-list {pl_name} in file '
+                '{input_file_name}'.format(permit_deny=diff_record.action,
+                                           ip_addr=diff_record.prefix,
+                                           pl_name=self.get_entry_name(diff_record.line_index),
+                                           input_file_name=input_file_name))
+            self.comparison.append(self.prefix_list_original[diff_record.line_index])
 
         return self.comparison
 
+    def compare_prefix_list_coverage(self, pl_object):
+        """
+        Method to compare the routes this prefix-list, and another permit, instead of the text of the entries
+        :param pl_object: The comparison object
+        :return:
+            A list of tuples of prefix range text, permitted by this prefix-list, and permitted by the other
+
+        """
+        LOGGER.debug('Starting Method compare_prefix_list_coverage in Class {class_type}'.format(class_type=type(self)))
+        if not isinstance(pl_object, PrefixListInformation):
+            LOGGER.critical('Method compare_prefix_list_coverage in Class {class_type}, expected a '
+                            '<PrefixListInformation> object but received a {item_type}'.format(class_type=self,
+                                                                                              item_type=pl_object))
+            raise TypeError('expected a <PrefixListInformation> object but received a '
+                            '{item_type}'.format(item_type=pl_object))
+
+        return mod.scripts.prefix_list_trie.prefix_list_coverage_diff(self.get_prefix_list_entries(),
+                                                                       pl_object.get_prefix_list_entries())
+
+    def get_prefix_list_entries(self, with_sequence=False):
+        """
+        Method to get the entries in sequence order, entries without a sequence number keep the file order
+        :param with_sequence: True to keep the sequence number in the tuples
+        :return:
+            A list of tuples of action, prefix, ge, and le
+
+        """
+        entries = self.get_sorted_list_entries()
+        if with_sequence:
+            return [(entry.sequence, entry.action, entry.get_prefix_text(), entry.ge, entry.le) for entry in entries]
+
+        return [(entry.action, entry.get_prefix_text(), entry.ge, entry.le) for entry in entries]
+
+    def get_sorted_list_entries(self):
+        """
+        Method to get the ListEntry objects in sequence order, entries without a sequence number keep the file order,
+        the entries of each prefix-list are kept together, and never sorted in to another prefix-list
+        :return:
+            A list of ListEntry in first match order
+
+        """
+        return list(chain.from_iterable(self.get_list_entry_groups().values()))
+
+    def get_list_entry_groups(self):
+        """
+        Method to get the ListEntry objects of each prefix-list, a file can have more than one prefix-list, and an
+        IOS-XR prefix-set can have IPv4, and IPv6 entries, each group is in sequence order
+        :return:
+            A OrderedDict of a tuple of the name, and 32 or 128 to a list of ListEntry in first match order
+
+        """
+        entry_groups = OrderedDict()
+        for entry in self.prefix_list_entries:
+            entry_groups.setdefault((self.get_entry_name(entry.line_index), entry.max_length), list()).append(entry)
+
+        for group_key, entries in entry_groups.items():
+            if all(entry.sequence is not None for entry in entries):
+                entry_groups[group_key] = sorted(entries, key=lambda entry: entry.sequence)
+
+        return entry_groups
+
+    def audit_prefix_list(self):
+        """
+        Method to find the entries that can never match, because an earlier entry matches every route first, and
+        the entries a later entry with the same action makes redundant, each prefix-list in the file is audited on its
+        own
+        :return:
+            A list of AuditRecord in first match order
+
+        """
+        LOGGER.debug('Starting Method audit_prefix_list in Class {class_type}'.format(class_type=type(self)))
+        audit_list = list()
+        for group_entries in self.get_list_entry_groups().values():
+            audit_list.extend(mod.scripts.prefix_list_trie.audit_prefix_list_entries(group_entries))
+
+        return audit_list
+
+    def get_minimized_prefix_list(self, sequence_step=5):
+        """
+        Method to make a prefix-list that matches every route the same as this prefix-list, with fewer entries, each
+        prefix-list in the file, and each IP version is minimized on its own, a prefix-list that denies every route
+        is one deny all entry
+        :param sequence_step: The step between the new sequence numbers
+        :return:
+            A list of prefix-list lines
+
+        """
+        LOGGER.debug('Starting Method get_minimized_prefix_list in Class {class_type}'.format(class_type=type(self)))
+        minimized_list = list()
+        for (pl_name, max_length), group_entries in self.get_list_entry_groups().items():
+            entries = mod.scripts.prefix_list_trie.minimize_prefix_list_entries(group_entries)
+            if not entries:
+                # Every route is denied, the prefix-list is kept with one deny all, because a route-map match of a
+                # prefix-list that does not exist matches every route
+                entries = [mod.scripts.prefix_list_trie.get_range_entry('deny', 0, 0, 0, max_length, max_length)]
+
+            for index, entry in enumerate(entries, start=1):
+                minimized_list.append('{ip_version} prefix-list {pl_name} seq {sequence} {entry_text}'.format(
+                    ip_version='ip' if max_length == 32 else 'ipv6', pl_name=pl_name,
+                    sequence=index * sequence_step,
+                    entry_text=format_prefix_list_entry((entry.action, entry.get_prefix_text(), entry.ge,
+                                                         entry.le))))
+
+        return minimized_list
+
+    def get_entry_text(self, entry):
+        """
+        Method to get the text of an entry after the action, from the original line of a prefix-list, or from the
+        entry of an IOS-XR prefix-set, where one line can have more than one entry
+        :param entry: A ListEntry of this prefix-list
+        :return:
+            A string example 10.0.0.0/8 le 24
+
+        """
+        line_split = self.prefix_list_original[entry.line_index].split()
+        if len(line_split) < 2 or line_split[1] != 'prefix-list':
+            return format_prefix_list_entry((entry.action, entry.get_prefix_text(), entry.ge,
+                                             entry.le)).split(' ', 1)[1]
+
+        return ' '.join(line_split[line_split.index(entry.action, 3) + 1:])
+
+    def get_entry_name(self, line_index):
+        """
+        Method to get the prefix-list, or prefix-set name of an entry
+        :param line_index: The index of the line of the entry
+        :return:
+            The name
+
+        """
+        position = bisect_right(self.prefix_list_names, (line_index + 1,)) - 1
+        return self.prefix_list_names[position][1]
+
+    def get_list_entries(self):
+        """
+        Method prefix_list_entries getter
+        :return:
+            A list of ListEntry in file order
+
+        """
+        return self.prefix_list_entries
+
     def get_prefix_list_permit_deny_dict(self):
         """
-        Method prefix_list_permit_deny_dict getter
+        Method prefix_list_permit_deny_dict getter, made from the entries
         :return:
             A dictionary
 
         """
-        return self.prefix_list_permit_deny_dict
+        permit_deny_dict = {'permit': list(),
+                            'deny': list()}
+        for entry in self.prefix_list_entries:
+            permit_deny_dict[entry.action].append((entry.line_index, self.get_entry_text(entry)))
+
+        return permit_deny_dict
 
     def get_prefix_list_original(self):
         """
@@ -163,30 +271,204 @@ class PrefixListInformation:
 
     def get_prefix_list_permit_statement_matcher(self):
         """
-        Method get_prefix_list_permit_statement_matcher getter
+        Method get_prefix_list_permit_statement_matcher getter, made from the entries
         :return:
             A List
 
         """
-        return self.prefix_list_permit_statement_matcher
+        return [self.get_entry_text(entry) for entry in self.prefix_list_entries if entry.action == 'permit']
 
     def get_prefix_list_deny_statement_matcher(self):
         """
-        Method get_prefix_list_deny_statement_matcher getter
+        Method get_prefix_list_deny_statement_matcher getter, made from the entries
         :return:
             A List
 
         """
-        return self.prefix_list_deny_statement_matcher
+        return [self.get_entry_text(entry) for entry in self.prefix_list_entries if entry.action == 'deny']
+
+    def get_prefix_list_permit_statement_counter(self):
+        """
+        Method get_prefix_list_permit_statement_counter getter, made from the entries
+        :return:
+            A Counter
+
+        """
+        return Counter(self.get_prefix_list_permit_statement_matcher())
+
+    def get_prefix_list_deny_statement_counter(self):
+        """
+        Method get_prefix_list_deny_statement_counter getter, made from the entries
+        :return:
+            A Counter
+
+        """
+        return Counter(self.get_prefix_list_deny_statement_matcher())
 
     def get_prefix_list_parts_list(self):
         """
-        Method get_prefix_list_parts_list getter
+        Method get_prefix_list_parts_list getter, split from the original lines
         :return:
             A List
 
         """
-        return self.prefix_list_parts_list
+        return [line.split() for line in self.prefix_list_original]
+
+
+def get_entry_lengths(length_split):
+    """
+    Function to pull apart the ge, le, and eq of an entry, eq is the same as ge, and le of the same length
+    :param length_split: The split line after the prefix example ['ge', '16', 'le', '24']
+    :return:
+        A tuple of ge or None, and le or None
+
+    """
+    lengths = {'ge': None, 'le': None, 'eq': None}
+    for keyword, length in zip(length_split[::2], length_split[1::2]):
+        if keyword in lengths and length.isdigit():
+            lengths[keyword] = int(length)
+
+    if lengths['eq'] is not None:
+        return lengths['eq'], lengths['eq']
+
+    return lengths['ge'], lengths['le']
+
+
+def get_prefix_list_entry(line_split):
+    """
+    Function to pull apart an IOS, or NX-OS prefix-list line
+    :param line_split: The split line example ['ip', 'prefix-list', 'PL', 'seq', '5', 'permit', '10.0.0.0/8', 'le', '24']
+    :return:
+        A tuple of sequence number or None, action, prefix, ge or None, and le or None, or None if the line is not
+        a permit, or deny entry
+
+    """
+    if len(line_split) < 5 or line_split[0] not in ('ip', 'ipv6') or line_split[1] != 'prefix-list':
+        return None
+
+    position = 3
+    sequence = None
+    if line_split[position] == 'seq' and len(line_split) > position + 3:
+        try:
+            sequence = int(line_split[position + 1])
+
+        except ValueError:
+            return None
+
+        position += 2
+
+    if line_split[position] not in ('permit', 'deny') or len(line_split) < position + 2:
+        return None
+
+    greater_equal, less_equal = get_entry_lengths(line_split[position + 2:])
+    return sequence, line_split[position], line_split[position + 1], greater_equal, less_equal
+
+
+def get_prefix_set_entry(entry_split):
+    """
+    Function to pull apart an IOS-XR prefix-set entry, every entry is a permit
+    :param entry_split: The split entry without the comma example ['10.0.0.0/8', 'le', '24']
+    :return:
+        A tuple of None, permit, prefix, ge or None, and le or None, or None if the entry is not a prefix
+
+    """
+    if not entry_split or '/' not in entry_split[0]:
+        return None
+
+    greater_equal, less_equal = get_entry_lengths(entry_split[1:])
+    return None, 'permit', entry_split[0], greater_equal, less_equal
+
+
+def iter_prefix_list_entries(lines):
+    """
+    Function to read the entries of IOS, and NX-OS prefix-lists, and IOS-XR prefix-sets one line at a time, into
+    the same entry tuples
+    :param lines: The lines, a list, or an open file
+    :return:
+        A generator of tuples of line index, prefix-list name, and a tuple of sequence number or None, action,
+        prefix, ge or None, and le or None
+
+    """
+    prefix_set_name = None
+    for index, line in enumerate(lines):
+        line_split = line.split()
+        if not line_split or line_split[0][0] in ('!', '#'):
+            continue
+
+        if prefix_set_name is not None:
+            if line_split[0] == 'end-set':
+                prefix_set_name = None
+                continue
+
+            for entry_text in line.split(','):
+                entry_tuple = get_prefix_set_entry(entry_text.split())
+                if entry_tuple:
+                    yield index, prefix_set_name, entry_tuple
+
+                elif entry_text.strip():
+                    LOGGER.warning('Line {index}, is not a prefix-set entry {line}'.format(index=index,
+                                                                                           line=line_split))
+
+        elif line_split[0] == 'prefix-set' and len(line_split) == 2:
+            prefix_set_name = line_split[1]
+
+        else:
+            entry_tuple = get_prefix_list_entry(line_split)
+            if entry_tuple:
+                yield index, line_split[2], entry_tuple
+
+            else:
+                LOGGER.warning('Line {index}, is not a prefix-list entry {line}'.format(index=index, line=line_split))
+
+
+def get_prefix_list_missing(pl_object, comparison_object, side):
+    """
+    Function to find the entries of a prefix-list that are not in another, each entry uses up one matching entry
+    of the other prefix-list, neither object is changed
+    :param pl_object: The PrefixListInformation to look for missing entries from
+    :param comparison_object: The PrefixListInformation to compare to
+    :param side: The side label for the records, A, or B
+    :return:
+        A list of DiffRecord
+
+    """
+    comparison_counter = Counter(entry.get_match_key() for entry in comparison_object.get_list_entries())
+    diff_records = list()
+    for action in ('permit', 'deny'):
+        for entry in pl_object.get_list_entries():
+            if entry.action != action:
+                continue
+
+            match_key = entry.get_match_key()
+            if comparison_counter[match_key] > 0:
+                comparison_counter[match_key] -= 1
+
+            else:
+                diff_records.append(mod.scripts.list_entry.DiffRecord(side, action, pl_object.get_entry_text(entry),
+                                                                      entry.line_index))
+
+    return diff_records
+
+
+def diff_prefix_lists(pl_object_a, pl_object_b):
+    """
+    Function to diff two parsed prefix-lists without storing anything in them, so a parsed prefix-list can be
+    compared to any number of others
+    :param pl_object_a: The "A" side PrefixListInformation
+    :param pl_object_b: The "B" side PrefixListInformation
+    :return:
+        A list of DiffRecord, the "A" side entries missing from "B", then the "B" side entries missing from "A"
+
+    """
+    for pl_object in (pl_object_a, pl_object_b):
+        if not isinstance(pl_object, PrefixListInformation):
+            LOGGER.critical('Function diff_prefix_lists expected a <PrefixListInformation> object but received a '
+                            '{item_type}'.format(item_type=type(pl_object)))
+            raise TypeError('expected a <PrefixListInformation> object but received a '
+                            '{item_type}'.format(item_type=type(pl_object)))
+
+    return get_prefix_list_missing(pl_object_a, pl_object_b, 'A') + \
+        get_prefix_list_missing(pl_object_b, pl_object_a, 'B')
 
 
 def prefix_list_diff(file_a, file_b, output_file, input_dir, output_dir):
@@ -218,3 +500,381 @@ def prefix_list_diff(file_a, file_b, output_file, input_dir, output_dir):
                                                                                          output_file,
                                                                                          output_dir),
                                                               folder=output_dir))
+
+
+def get_prefix_lists(config_lines):
+    """
+    Function to group the prefix-list, and IOS-XR prefix-set lines of a config by prefix-list in one pass
+    :param config_lines: A list of the lines of a show run
+    :return:
+        A OrderedDict of prefix-list example "ip prefix-list PL-NAME", or "prefix-set PS-NAME" to a list of its lines
+
+    """
+    prefix_lists = OrderedDict()
+    prefix_set_lines = None
+    for line in config_lines:
+        line_split = line.split()
+        if prefix_set_lines is not None:
+            prefix_set_lines.append(' '.join(line_split))
+            if line_split and line_split[0] == 'end-set':
+                prefix_set_lines = None
+
+        elif len(line_split) > 3 and line_split[1] == 'prefix-list' and line_split[0] in ('ip', 'ipv6'):
+            prefix_lists.setdefault(' '.join(line_split[:3]), list()).append(' '.join(line_split))
+
+        elif len(line_split) == 2 and line_split[0] == 'prefix-set':
+            prefix_set_lines = prefix_lists.setdefault(' '.join(line_split), list())
+            prefix_set_lines.append(' '.join(line_split))
+
+    return prefix_lists
+
+
+def get_semantic_diff_lines(pl_obj_a, pl_obj_b, name_a, name_b):
+    """
+    Function to diff the routes two prefix-lists permit, and make the output lines
+    :param pl_obj_a: The "A" side PrefixListInformation
+    :param pl_obj_b: The "B" side PrefixListInformation
+    :param name_a: The name of the "A" side
+    :param name_b: The name of the "B" side
+    :return:
+        A list of lines, empty if the prefix-lists permit the same routes
+
+    """
+    differences = pl_obj_a.compare_prefix_list_coverage(pl_obj_b)
+    if not differences:
+        return list()
+
+    output_list = list()
+    for a_permits, heading in ((True, 'Permitted by {name_a}, and denied by {name_b}'),
+                               (False, 'Denied by {name_a}, and permitted by {name_b}')):
+        output_list.append(heading.format(name_a=name_a, name_b=name_b))
+        output_list.extend(prefix_range for prefix_range, a_permit, b_permit in differences
+                           if a_permit == a_permits)
+
+    return output_list
+
+
+def prefix_list_config_diff(file_a, file_b, output_file, input_dir, output_dir, semantic=False):
+    """
+    Function to diff every prefix-list of two show runs, prefix-lists are paired by name
+    :param file_a: The name of the "A" show run
+    :param file_b: The name of the "B" show run
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :param semantic: True to diff the routes the prefix-lists permit, instead of the text of the entries
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_config_diff')
+
+    prefix_lists_a = get_prefix_lists(pdt.file_to_list(file_a, input_dir))
+    prefix_lists_b = get_prefix_lists(pdt.file_to_list(file_b, input_dir))
+
+    output_list = list()
+    for pl_name in prefix_lists_a:
+        if pl_name not in prefix_lists_b:
+            output_list.append('{pl_name} only in file {file_a}'.format(pl_name=pl_name, file_a=file_a))
+
+    for pl_name in prefix_lists_b:
+        if pl_name not in prefix_lists_a:
+            output_list.append('{pl_name} only in file {file_b}'.format(pl_name=pl_name, file_b=file_b))
+
+    same_count = 0
+    for pl_name in prefix_lists_a:
+        if pl_name not in prefix_lists_b:
+            continue
+
+        pl_obj_a = PrefixListInformation(prefix_lists_a[pl_name])
+        pl_obj_b = PrefixListInformation(prefix_lists_b[pl_name])
+        if semantic:
+            pl_output = get_semantic_diff_lines(pl_obj_a, pl_obj_b, file_a, file_b)
+
+        else:
+            pl_output = pl_obj_a.compare_prefix_list(pl_obj_b, file_b)
+            pl_output += pl_obj_b.compare_prefix_list(pl_obj_a, file_a)
+
+        if pl_output:
+            output_list.append('!')
+            output_list.append('{pl_name} is different'.format(pl_name=pl_name))
+            output_list.extend(pl_output)
+
+        else:
+            same_count += 1
+
+    output_list.append('!')
+    output_list.append('{same_count} prefix-lists are the same'.format(same_count=same_count))
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
+
+
+def prefix_list_semantic_diff(file_a, file_b, output_file, input_dir, output_dir):
+    """
+    Function to diff the routes two prefix-lists permit, instead of the text of the entries
+    :param file_a: The name of file a
+    :param file_b: The name of file b
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_semantic_diff')
+
+    pl_obj_a = PrefixListInformation(pdt.file_to_list(file_a, input_dir))
+    pl_obj_b = PrefixListInformation(pdt.file_to_list(file_b, input_dir))
+
+    output_list = get_semantic_diff_lines(pl_obj_a, pl_obj_b, file_a, file_b)
+    if not output_list:
+        output_list = ['{file_a}, and {file_b} permit the same routes'.format(file_a=file_a, file_b=file_b)]
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
+
+
+def format_prefix_list_entry(entry):
+    """
+    Function to format a prefix-list entry without the name, and sequence number
+    :param entry: A tuple of action, prefix, ge, and le
+    :return:
+        A string example permit 10.0.0.0/8 ge 24 le 28
+
+    """
+    action, prefix, greater_equal, less_equal = entry
+    entry_text = '{action} {prefix}'.format(action=action, prefix=prefix)
+    if greater_equal:
+        entry_text += ' ge {greater_equal}'.format(greater_equal=greater_equal)
+
+    if less_equal:
+        entry_text += ' le {less_equal}'.format(less_equal=less_equal)
+
+    return entry_text
+
+
+def get_prefix_list_consistency(pl_objects):
+    """
+    Function to compare the same prefix-list on many devices in one pass, each entry is interned in a table shared
+    by all the devices, the consensus is the entries on more than half of the devices
+    :param pl_objects: A OrderedDict of device name to PrefixListInformation, or None if the device does not have
+                       the prefix-list
+    :return:
+        A tuple of entry_table, consensus, and deviations
+        entry_table: A list of entry tuples of action, prefix, ge, and le, an entry index is an index in this list
+        consensus: A set of the entry indexes on more than half of the devices
+        deviations: A OrderedDict of device name to a tuple of the set of entry indexes added, and the set of entry
+                    indexes omitted compared to the consensus
+
+    """
+    LOGGER.debug('Starting Function get_prefix_list_consistency')
+    entry_table = list()
+    entry_indexes = dict()
+    device_entries = OrderedDict()
+    entry_counts = Counter()
+    for device_name, pl_object in pl_objects.items():
+        device_entries[device_name] = set()
+        if pl_object is None:
+            continue
+
+        for entry in pl_object.get_prefix_list_entries():
+            if entry not in entry_indexes:
+                entry_indexes[entry] = len(entry_table)
+                entry_table.append(entry)
+            device_entries[device_name].add(entry_indexes[entry])
+
+        entry_counts.update(device_entries[device_name])
+
+    consensus = set(entry_index for entry_index, count in entry_counts.items() if count * 2 > len(pl_objects))
+    deviations = OrderedDict()
+    for device_name, entries in device_entries.items():
+        deviations[device_name] = (entries - consensus, consensus - entries)
+
+    return entry_table, consensus, deviations
+
+
+def prefix_list_fleet_check(file_pattern, output_file, input_dir, output_dir, pl_name=None):
+    """
+    Function to check a prefix-list is the same on many devices, and output a deviation matrix
+    :param file_pattern: A folder name, or a glob pattern in the input directory
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :param pl_name: The name of the prefix-list to pull out of full show runs, None if each file is only the
+                    prefix-list
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_fleet_check')
+    pl_objects = OrderedDict()
+    for file_path in mod.scripts.config_spliter.get_config_file_paths(file_pattern, input_dir):
+        file_lines = pdt.file_to_list(os.path.basename(file_path), os.path.dirname(file_path))
+        if pl_name:
+            prefix_lists = get_prefix_lists(file_lines)
+            file_lines = prefix_lists.get('ip prefix-list {pl_name}'.format(pl_name=pl_name)) or \
+                prefix_lists.get('ipv6 prefix-list {pl_name}'.format(pl_name=pl_name)) or \
+                prefix_lists.get('prefix-set {pl_name}'.format(pl_name=pl_name))
+
+        pl_objects[os.path.basename(file_path)] = PrefixListInformation(file_lines) if file_lines else None
+
+    entry_table, consensus, deviations = get_prefix_list_consistency(pl_objects)
+
+    output_list = ['Consensus {consensus} entries, on more than half of {devices} devices'.format(
+        consensus=len(consensus), devices=len(pl_objects))]
+    device_labels = list()
+    for device_number, device_name in enumerate(deviations, 1):
+        device_labels.append('D{device_number}'.format(device_number=device_number))
+        added, omitted = deviations[device_name]
+        status = 'prefix-list not found' if pl_objects[device_name] is None else \
+            'additions {added} omissions {omitted}'.format(added=len(added), omitted=len(omitted))
+        output_list.append('{label:5} {device_name} {status}'.format(label=device_labels[-1], device_name=device_name,
+                                                                     status=status))
+
+    deviating_entries = sorted(set().union(*(added | omitted for added, omitted in deviations.values())))
+    output_list.append('!')
+    if not deviating_entries:
+        output_list.append('All devices match the consensus')
+
+    else:
+        entry_width = max(len(format_prefix_list_entry(entry_table[entry_index]))
+                          for entry_index in deviating_entries)
+        output_list.append('{heading:{entry_width}}  {labels}'.format(
+            heading='+ not in consensus, - missing', entry_width=entry_width,
+            labels=' '.join('{label:5}'.format(label=label) for label in device_labels)).rstrip())
+        for entry_index in deviating_entries:
+            marks = list()
+            for added, omitted in deviations.values():
+                marks.append('+' if entry_index in added else '-' if entry_index in omitted else '.')
+
+            output_list.append('{entry:{entry_width}}  {marks}'.format(
+                entry=format_prefix_list_entry(entry_table[entry_index]), entry_width=entry_width,
+                marks=' '.join('{mark:5}'.format(mark=mark) for mark in marks)).rstrip())
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
+
+
+def prefix_list_route_eval(pl_file, route_file, output_file, input_dir, output_dir, summary=False):
+    """
+    Function to run the routes of a show ip bgp, show ip route, or show route through a prefix-list, and output
+    the routes each entry permits, or denies, and the routes no entry matches
+    :param pl_file: The name of the prefix-list file
+    :param route_file: The name of the routing output file
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :param summary: True to only output the route counts
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_route_eval')
+    pl_object = PrefixListInformation(pdt.file_to_list(pl_file, input_dir))
+    entries = pl_object.get_prefix_list_entries(with_sequence=True)
+    route_matcher = mod.scripts.prefix_list_trie.PrefixListMatcher([entry[1:] for entry in entries])
+
+    entry_routes = [list() for _ in entries]
+    no_match_routes = list()
+    route_count = 0
+    for route, value, length, max_length in mod.scripts.prefix_list_trie.iter_route_prefixes(route_file, input_dir):
+        route_count += 1
+        entry_index = route_matcher.match(value, length, max_length)
+        if entry_index is None:
+            no_match_routes.append(route)
+
+        else:
+            entry_routes[entry_index].append(route)
+
+    output_list = ['{route_count} routes read from {route_file}'.format(route_count=route_count,
+                                                                        route_file=route_file)]
+    for entry, routes in zip(entries, entry_routes):
+        sequence_text = 'seq {sequence} '.format(sequence=entry[0]) if entry[0] is not None else ''
+        output_list.append('{sequence_text}{entry_text}: {count} routes {action}'.format(
+            sequence_text=sequence_text, entry_text=format_prefix_list_entry(entry[1:]), count=len(routes),
+            action='permitted' if entry[1] == 'permit' else 'denied'))
+        if not summary:
+            output_list.extend('    {route}'.format(route=route) for route in routes)
+
+    output_list.append('No entry matched: {count} routes denied'.format(count=len(no_match_routes)))
+    if not summary:
+        output_list.extend('    {route}'.format(route=route) for route in no_match_routes)
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
+
+
+def prefix_list_audit(pl_file, output_file, input_dir, output_dir):
+    """
+    Function to output the shadowed, and redundant entries of a prefix-list
+    :param pl_file: The name of the prefix-list file
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_audit')
+    pl_object = PrefixListInformation(pdt.file_to_list(pl_file, input_dir))
+    original_lines = pl_object.get_prefix_list_original()
+    audit_records = pl_object.audit_prefix_list()
+
+    output_list = list()
+    for kind, heading, reason in (('shadowed', 'Shadowed entries, an earlier entry matches every route first',
+                                   'shadowed by'),
+                                  ('redundant', 'Redundant entries, a later entry with the same action matches '
+                                                'every route', 'redundant with')):
+        kind_records = [audit_record for audit_record in audit_records if audit_record.kind == kind]
+        output_list.append('{heading}: {count}'.format(heading=heading, count=len(kind_records)))
+        for audit_record in kind_records:
+            output_list.append(original_lines[audit_record.entry.line_index].strip())
+            output_list.append('    {reason} {other_line}'.format(
+                reason=reason, other_line=original_lines[audit_record.other.line_index].strip()))
+
+        output_list.append('!')
+
+    output_list.append('{count} entries checked'.format(count=len(pl_object.get_list_entries())))
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
+
+
+def prefix_list_minimize(pl_file, output_file, input_dir, output_dir):
+    """
+    Function to output a prefix-list that matches every route the same as a prefix-list, with fewer entries
+    :param pl_file: The name of the prefix-list file
+    :param output_file: The name of the output file
+    :param input_dir: The name of the input directory
+    :param output_dir: The name of the output directory
+    :return:
+        None
+
+    """
+    LOGGER.debug('Starting Function prefix_list_minimize')
+    pl_object = PrefixListInformation(pdt.file_to_list(pl_file, input_dir))
+    output_list = pl_object.get_minimized_prefix_list()
+    print('{entry_count} entries minimized to {line_count}'.format(entry_count=len(pl_object.get_list_entries()),
+                                                                   line_count=len(output_list)))
+
+    output_file = pdt.file_name_increase(output_file, output_dir)
+    print('File named {file_name} created in {folder}'.format(file_name=pdt.list_to_file(output_list,
+                                                                                         output_file,
+                                                                                         output_dir),
+                                                              folder=output_dir))
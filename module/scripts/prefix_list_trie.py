@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+import logging
+import ipaddress
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import chain
+import os
+import re
+import socket
+import sys
+import module as mod
+__author__ = 'Benjamin P. Trachtenberg'
+__copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
+__credits__ = ''
+__license__ = ''
+__status__ = 'prod'
+__version_info__ = (1, 0, 4, __status__)
+__version__ = '.'.join(map(str, __version_info__))
+__maintainer__ = 'Benjamin P. Trachtenberg'
+__email__ = 'e_ben_75-python@yahoo.com'
+
+LOGGER = logging.getLogger(__name__)
+
+# An address with a mask anywhere in the line, the first one is the route
+ROUTE_PREFIX_REGEX = re.compile(r'(?<![\w.:])((?:[0-9]{1,3}\.){3}[0-9]{1,3}|[0-9a-fA-F]*:[0-9a-fA-F:]*)/([0-9]{1,3})\b')
+# A show ip bgp network, the status codes come first, and can touch the network example *>i172.16.0.0/12, path
+# lines without a network do not match
+BGP_NETWORK_REGEX = re.compile(r'^[sdhrSmbfxac*>i= ]{1,5}((?:[0-9]{1,3}\.){3}[0-9]{1,3}|[0-9a-fA-F]*:[0-9a-fA-F:]*)'
+                               r'(?:/([0-9]{1,3}))?(?=\s|$)')
+# A show ip route subnet without a mask, the mask is in the "is subnetted" line above it, the via can be on the
+# next line
+ROUTE_NETWORK_REGEX = re.compile(r'^[A-Za-z*+%][A-Za-z0-9*+% ]*?\s((?:[0-9]{1,3}\.){3}[0-9]{1,3})(?: \[| is |\s*$)')
+# A line with a short code, and an address near the start, that is most likely a route
+ROUTE_LIKE_REGEX = re.compile(r'^\S[\S ]{0,5}?\s{1,8}(?:[0-9]{1,3}\.){3}[0-9]{1,3}')
+
+# kind is shadowed, or redundant, entry is the ListEntry found, and other is the ListEntry that covers it
+AuditRecord = namedtuple('AuditRecord', ['kind', 'entry', 'other'])
+
+# The match code of an entry is its sequence index * 2, plus 1 for permit, so the lowest code is the first match
+NO_MATCH = sys.maxsize
+
+
+def get_match_code(index, action):
+    """
+    Function to make the match code of an entry, a lower match code is an earlier entry, so the first match is the
+    lowest match code
+    :param index: The index of the entry in first match order
+    :param action: permit, or deny
+    :return:
+        An integer, the index times 2, plus 1 for permit
+
+    """
+    return index * 2 + (1 if action == 'permit' else 0)
+
+
+def is_permit(match_code):
+    """
+    Function to check if a match code is a permit entry
+    :param match_code: The match code from get_match_code, or NO_MATCH
+    :return:
+        True if the match code is a permit entry, False if it is a deny entry, or NO_MATCH
+
+    """
+    return match_code != NO_MATCH and bool(match_code & 1)
+
+
+class PrefixTrieNode:
+    """
+    Class for one node of a PrefixListTrie, a prefix, and the entries of each side that have that prefix
+    """
+    __slots__ = ('value', 'length', 'children', 'entries')
+
+    def __init__(self, value, length):
+        self.value = value
+        self.length = length
+        self.children = [None, None]
+        self.entries = None
+
+    def add_entry(self, side, lower, upper, match_code):
+        if self.entries is None:
+            self.entries = list()
+
+        self.entries.append((side, lower, upper, match_code))
+
+
+class PrefixListTrie:
+    """
+    Class for a path compressed binary radix trie of the entries of two prefix-lists, side 0 is the "A" side, and
+    side 1 is the "B" side, used to find the routes the two prefix-lists do not treat the same
+    """
+    def __init__(self, max_length=32):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.max_length = max_length
+        self.root = PrefixTrieNode(0, 0)
+
+    def __bit(self, value, position):
+        return (value >> (self.max_length - position - 1)) & 1
+
+    def __truncate(self, value, length):
+        return value & ~((1 << (self.max_length - length)) - 1)
+
+    def insert(self, value, length, side, lower, upper, match_code):
+        """
+        Method to add a prefix-list entry
+        :param value: The network address as an integer
+        :param length: The prefix length
+        :param side: 0 for the "A" side, 1 for the "B" side
+        :param lower: The shortest route length matched, ge
+        :param upper: The longest route length matched, le
+        :param match_code: The code from get_match_code
+        :return:
+            None
+
+        """
+        max_length = self.max_length
+        value = self.__truncate(value, length)
+        node = self.root
+        while True:
+            if node.length == length:
+                node.add_entry(side, lower, upper, match_code)
+                return
+
+            bit = (value >> (max_length - node.length - 1)) & 1
+            child = node.children[bit]
+            if child is None:
+                child = PrefixTrieNode(value, length)
+                child.add_entry(side, lower, upper, match_code)
+                node.children[bit] = child
+                return
+
+            shift = max_length - child.length
+            if child.length <= length and value >> shift == child.value >> shift:
+                node = child
+                continue
+
+            common_length = min(length, child.length)
+            different_bits = value ^ child.value
+            if different_bits:
+                common_length = min(common_length, self.max_length - different_bits.bit_length())
+
+            if common_length == child.length:
+                node = child
+                continue
+
+            split_node = PrefixTrieNode(self.__truncate(value, common_length), common_length)
+            split_node.children[self.__bit(child.value, common_length)] = child
+            node.children[bit] = split_node
+            node = split_node
+
+    def coverage_diff(self):
+        """
+        Method to walk the trie once, and find the route spaces where the first matching entry of each side
+        gives a different answer, routes with no match are denied
+        :return:
+            A list of tuples of network value, prefix length, ge, le, "A" permits, and "B" permits
+
+        """
+        LOGGER.debug('Starting method coverage_diff in class {class_obj}'.format(class_obj=type(self)))
+        differences = list()
+        no_match = [NO_MATCH] * (self.max_length + 1)
+        node_stack = [(self.root, (no_match, no_match))]
+        while node_stack:
+            node, match_codes = node_stack.pop()
+            if node.entries:
+                match_codes = (list(match_codes[0]), list(match_codes[1]))
+                for side, lower, upper, match_code in node.entries:
+                    side_codes = match_codes[side]
+                    for route_length in range(lower, upper + 1):
+                        if match_code < side_codes[route_length]:
+                            side_codes[route_length] = match_code
+
+            if match_codes[0][node.length:] != match_codes[1][node.length:]:
+                runs = self.__get_diff_runs(node.length, match_codes)
+                if runs:
+                    self.__add_node_differences(node, runs, differences)
+
+            for child in reversed(node.children):
+                if child is not None:
+                    node_stack.append((child, match_codes))
+
+        return differences
+
+    def __get_diff_runs(self, length, match_codes):
+        """
+        Method to find the runs of route lengths where the sides give a different answer
+        :param length: The shortest route length to look at
+        :param match_codes: A tuple of the match code lists of each side
+        :return:
+            A list of tuples of first length, last length, "A" permits, and "B" permits
+
+        """
+        runs = list()
+        for route_length in range(length, self.max_length + 1):
+            a_permit = is_permit(match_codes[0][route_length])
+            b_permit = is_permit(match_codes[1][route_length])
+            if a_permit == b_permit:
+                continue
+
+            if runs and runs[-1][1] == route_length - 1 and runs[-1][2] == a_permit:
+                runs[-1] = (runs[-1][0], route_length, a_permit, b_permit)
+
+            else:
+                runs.append((route_length, route_length, a_permit, b_permit))
+
+        return runs
+
+    def __add_node_differences(self, node, runs, differences):
+        """
+        Method to add the differences for the routes whose longest matching prefix in the trie is the node,
+        that is the node prefix itself, the prefixes on the path down to each child, and the subtrees
+        that branch off of those paths
+        :param node: The PrefixTrieNode
+        :param runs: The runs from __get_diff_runs
+        :param differences: The list to add to
+        :return:
+            None
+
+        """
+        def add_exact(value, length):
+            for first_length, last_length, a_permit, b_permit in runs:
+                if first_length <= length <= last_length:
+                    differences.append((value, length, length, length, a_permit, b_permit))
+
+        def add_subtree(value, length):
+            for first_length, last_length, a_permit, b_permit in runs:
+                if last_length >= length:
+                    differences.append((value, length, max(first_length, length), last_length, a_permit, b_permit))
+
+        if node.children == [None, None]:
+            add_subtree(node.value, node.length)
+            return
+
+        add_exact(node.value, node.length)
+
+        for bit, child in enumerate(node.children):
+            branch_value = node.value | (bit << (self.max_length - node.length - 1))
+            if child is None:
+                add_subtree(branch_value, node.length + 1)
+                continue
+
+            for length in range(node.length + 1, child.length):
+                add_exact(self.__truncate(child.value, length), length)
+
+            for length in range(node.length + 2, child.length + 1):
+                add_subtree(self.__truncate(child.value, length) ^ (1 << (self.max_length - length)), length)
+
+
+def format_prefix_range(value, length, lower, upper, max_length):
+    """
+    Function to format a route space as prefix-list text
+    :param value: The network address as an integer
+    :param length: The prefix length
+    :param lower: The shortest route length
+    :param upper: The longest route length
+    :param max_length: 32 for IPv4, or 128 for IPv6
+    :return:
+        A string example 10.0.0.0/8 ge 24 le 28
+
+    """
+    if max_length == 32:
+        network = '{address}/{length}'.format(address=ipaddress.IPv4Address(value), length=length)
+
+    else:
+        network = '{address}/{length}'.format(address=ipaddress.IPv6Address(value), length=length)
+
+    if lower == length and upper == length:
+        return network
+
+    if lower == length:
+        return '{network} le {upper}'.format(network=network, upper=upper)
+
+    if upper == max_length:
+        return '{network} ge {lower}'.format(network=network, lower=lower)
+
+    return '{network} ge {lower} le {upper}'.format(network=network, lower=lower, upper=upper)
+
+
+def prefix_list_coverage_diff(entries_a, entries_b):
+    """
+    Function to find the routes two prefix-lists do not treat the same, first match in sequence order,
+    and the implicit deny at the end
+    :param entries_a: A list of tuples of action, prefix, ge, and le in sequence order for the "A" side
+    :param entries_b: A list of tuples of action, prefix, ge, and le in sequence order for the "B" side
+    :return:
+        A list of tuples of prefix range text, "A" permits, and "B" permits
+
+    """
+    LOGGER.debug('Starting Function prefix_list_coverage_diff')
+    tries = dict()
+    networks = dict()
+    for side, entries in enumerate((entries_a, entries_b)):
+        for index, (action, prefix, greater_equal, less_equal) in enumerate(entries):
+            network = networks.get(prefix)
+            if network is None:
+                try:
+                    network = networks[prefix] = ipaddress.ip_network(prefix, strict=False)
+
+                except ValueError as e:
+                    LOGGER.warning('Skipping bad prefix {prefix} {error}'.format(prefix=prefix, error=e))
+                    continue
+
+            max_length = network.max_prefixlen
+            lower = greater_equal or network.prefixlen
+            upper = less_equal or (max_length if greater_equal else network.prefixlen)
+            lower = max(lower, network.prefixlen)
+            if lower > upper or upper > max_length:
+                LOGGER.warning('Skipping bad range {prefix} ge {lower} le {upper}'.format(prefix=prefix, lower=lower,
+                                                                                         upper=upper))
+                continue
+
+            if max_length not in tries:
+                tries[max_length] = PrefixListTrie(max_length)
+
+            tries[max_length].insert(int(network.network_address), network.prefixlen, side, lower, upper,
+                                     get_match_code(index, action))
+
+    differences = list()
+    for max_length in sorted(tries):
+        for value, length, lower, upper, a_permit, b_permit in tries[max_length].coverage_diff():
+            differences.append((format_prefix_range(value, length, lower, upper, max_length), a_permit, b_permit))
+
+    return differences
+
+
+class PrefixListMatcher:
+    """
+    Class to compile prefix-list entries for matching a lot of routes, there is a hash table for each prefix length
+    in the list, so a route is looked up once per length, and the lowest sequence index that matches wins
+    """
+    def __init__(self, entries):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.tables = dict()
+        self.lengths = dict()
+        for index, (action, prefix, greater_equal, less_equal) in enumerate(entries):
+            try:
+                network = ipaddress.ip_network(prefix, strict=False)
+
+            except ValueError as e:
+                LOGGER.warning('Skipping bad prefix {prefix} {error}'.format(prefix=prefix, error=e))
+                continue
+
+            max_length = network.max_prefixlen
+            lower = max(greater_equal or network.prefixlen, network.prefixlen)
+            upper = less_equal or (max_length if greater_equal else network.prefixlen)
+            length_tables = self.tables.setdefault(max_length, dict())
+            key = int(network.network_address) >> (max_length - network.prefixlen)
+            length_tables.setdefault(network.prefixlen, dict()).setdefault(key, list()).append((lower, upper, index))
+
+        for max_length, length_tables in self.tables.items():
+            self.lengths[max_length] = sorted(length_tables)
+
+    def match(self, value, length, max_length=32):
+        """
+        Method to find the first entry that matches a route
+        :param value: The network address of the route as an integer
+        :param length: The prefix length of the route
+        :param max_length: 32 for IPv4, or 128 for IPv6
+        :return:
+            The index of the entry, or None when no entry matches
+
+        """
+        length_tables = self.tables.get(max_length)
+        if not length_tables:
+            return None
+
+        best_index = None
+        for prefix_length in self.lengths[max_length]:
+            if prefix_length > length:
+                break
+
+            bucket = length_tables[prefix_length].get(value >> (max_length - prefix_length))
+            if bucket:
+                for lower, upper, index in bucket:
+                    if lower <= length <= upper:
+                        if best_index is None or index < best_index:
+                            best_index = index
+                        break
+
+        return best_index
+
+
+def get_classful_length(address):
+    """
+    Function to get the classful prefix length of an IPv4 address, for route lines without a prefix length
+    :param address: The address example 10.0.0.0
+    :return:
+        8 for class A, 16 for class B, or 24 for class C and above
+
+    """
+    first_octet = int(address.split('.', 1)[0])
+    if first_octet < 128:
+        return 8
+
+    if first_octet < 192:
+        return 16
+
+    return 24
+
+
+def iter_route_prefixes(file_name, file_location):
+    """
+    Function to read the routes of a show ip bgp, show ip route, or show route one line at a time
+    :param file_name: The name of the file
+    :param file_location: The location of the file
+    :return:
+        A generator of tuples of route text, network value, prefix length, and 32 or 128
+
+    """
+    subnet_length = None
+    subnet_column = None
+    skipped_count = 0
+    with open(os.path.join(file_location, file_name), 'r') as route_file:
+        for line in route_file:
+            prefix_match = ROUTE_PREFIX_REGEX.search(line)
+            if 'subnetted' in line:
+                subnet_length = int(prefix_match.group(2)) if prefix_match and 'variably' not in line else None
+                subnet_column = prefix_match.start(1) if prefix_match else None
+                continue
+
+            network_match = BGP_NETWORK_REGEX.match(line) or prefix_match or ROUTE_NETWORK_REGEX.match(line)
+            if not network_match:
+                if line.strip() and not line[0].isspace():
+                    subnet_length = subnet_column = None
+
+                if ROUTE_LIKE_REGEX.match(line):
+                    LOGGER.debug('Skipping route line {line}'.format(line=line.rstrip()))
+                    skipped_count += 1
+
+                continue
+
+            if subnet_column is not None and network_match.start(1) <= subnet_column:
+                subnet_length = subnet_column = None
+
+            address = network_match.group(1)
+            if network_match.re is not ROUTE_NETWORK_REGEX and network_match.group(2):
+                length = int(network_match.group(2))
+
+            elif ':' in address:
+                LOGGER.debug('Skipping IPv6 route without a mask {line}'.format(line=line.rstrip()))
+                skipped_count += 1
+                continue
+
+            else:
+                length = subnet_length if subnet_length is not None else get_classful_length(address)
+
+            try:
+                if ':' in address:
+                    max_length = 128
+                    value = int(ipaddress.IPv6Address(address))
+
+                else:
+                    max_length = 32
+                    value = int.from_bytes(socket.inet_aton(address), 'big')
+
+            except (OSError, ValueError):
+                LOGGER.debug('Skipping bad route address {line}'.format(line=line.rstrip()))
+                skipped_count += 1
+                continue
+
+            if length > max_length:
+                LOGGER.debug('Skipping bad route mask {line}'.format(line=line.rstrip()))
+                skipped_count += 1
+                continue
+
+            value = value >> (max_length - length) << (max_length - length)
+            yield '{address}/{length}'.format(address=address, length=length), value, length, max_length
+
+    if skipped_count:
+        LOGGER.warning('Skipped {skipped_count} lines in {file_name} that look like routes, but could not be '
+                       'read'.format(skipped_count=skipped_count, file_name=file_name))
+
+
+def get_entry_range(entry):
+    """
+    Function to get the routes a prefix-list entry matches
+    :param entry: A ListEntry
+    :return:
+        A tuple of the network value, prefix length, shortest route length, longest route length, and 32 or 128,
+        or None if the ge, and le are not valid for the prefix
+
+    """
+    length, max_length = entry.length, entry.max_length
+    lower = max(entry.ge or length, length)
+    upper = entry.le or (max_length if entry.ge else length)
+    if lower > upper or upper > max_length:
+        LOGGER.warning('Skipping bad range {prefix} ge {lower} le {upper}'.format(prefix=entry.get_prefix_text(),
+                                                                                 lower=lower, upper=upper))
+        return None
+
+    value = entry.network >> (max_length - length) << (max_length - length)
+    return value, length, lower, upper, max_length
+
+
+class PrefixRangeIndex:
+    """
+    Class to index the route ranges of prefix-list entries by prefix length, the entries with a prefix that holds
+    a prefix are found with one hash lookup for each length, and the entries inside a prefix with one binary search
+    for each length, so no entry is compared to every other entry
+    """
+    def __init__(self, ranges):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        self.ranges = ranges
+        self.tables = dict()
+        self.sorted_keys = dict()
+        for index, entry_range in enumerate(ranges):
+            if entry_range is None:
+                continue
+
+            value, length, lower, upper, max_length = entry_range
+            length_tables = self.tables.setdefault(max_length, dict())
+            length_tables.setdefault(length, dict()).setdefault(value >> (max_length - length), list()).append(index)
+
+        for max_length, length_tables in self.tables.items():
+            self.sorted_keys[max_length] = [(length, sorted(length_tables[length])) for length in sorted(length_tables)]
+
+    def iter_holding(self, index):
+        """
+        Method to find the entries with a prefix that is the same as, or holds the prefix of an entry
+        :param index: The index of the entry
+        :return:
+            A generator of entry indexes, the entry itself is not in it
+
+        """
+        value, length, lower, upper, max_length = self.ranges[index]
+        for prefix_length, keys in self.sorted_keys[max_length]:
+            if prefix_length > length:
+                break
+
+            for other_index in self.tables[max_length][prefix_length].get(value >> (max_length - prefix_length), ()):
+                if other_index != index:
+                    yield other_index
+
+    def iter_inside(self, index):
+        """
+        Method to find the entries with a prefix inside the prefix of an entry, and longer
+        :param index: The index of the entry
+        :return:
+            A generator of entry indexes
+
+        """
+        value, length, lower, upper, max_length = self.ranges[index]
+        for prefix_length, keys in self.sorted_keys[max_length]:
+            if prefix_length <= length:
+                continue
+
+            first_key = value >> (max_length - prefix_length)
+            last_key = first_key + (1 << (prefix_length - length)) - 1
+            key_tables = self.tables[max_length][prefix_length]
+            for position in range(bisect_left(keys, first_key), len(keys)):
+                if keys[position] > last_key:
+                    break
+
+                for other_index in key_tables[keys[position]]:
+                    yield other_index
+
+
+def audit_prefix_list_entries(entries):
+    """
+    Function to find the entries of a prefix-list that can never match, because an earlier entry matches every
+    route first, and the entries that can be removed, because a later entry with the same action matches every
+    route, and no entry between them with the other action matches any of the routes, a later entry that matches
+    the same routes is shadowed, so it does not make an entry redundant
+    :param entries: A list of ListEntry in first match order
+    :return:
+        A list of AuditRecord in first match order
+
+    """
+    LOGGER.debug('Starting Function audit_prefix_list_entries')
+    ranges = [get_entry_range(entry) for entry in entries]
+    range_index = PrefixRangeIndex(ranges)
+    audit_records = list()
+    for index, entry_range in enumerate(ranges):
+        if entry_range is None:
+            continue
+
+        lower, upper = entry_range[2:4]
+        shadow_index = None
+        cover_index = None
+        for other_index in range_index.iter_holding(index):
+            other_lower, other_upper = ranges[other_index][2:4]
+            if other_lower > lower or other_upper < upper:
+                continue
+
+            if other_index < index:
+                if shadow_index is None or other_index < shadow_index:
+                    shadow_index = other_index
+
+            elif entries[other_index].action == entries[index].action and ranges[other_index] != entry_range:
+                if cover_index is None or other_index < cover_index:
+                    cover_index = other_index
+
+        if shadow_index is not None:
+            audit_records.append(AuditRecord('shadowed', entries[index], entries[shadow_index]))
+            continue
+
+        if cover_index is None:
+            continue
+
+        for other_index in chain(range_index.iter_holding(index), range_index.iter_inside(index)):
+            if index < other_index < cover_index and entries[other_index].action != entries[index].action:
+                other_lower, other_upper = ranges[other_index][2:4]
+                if other_lower <= upper and lower <= other_upper:
+                    break
+
+        else:
+            audit_records.append(AuditRecord('redundant', entries[index], entries[cover_index]))
+
+    return audit_records
+
+
+def get_range_entry(action, value, length, lower, upper, max_length):
+    """
+    Function to make a ListEntry that matches a route range
+    :param action: permit, or deny
+    :param value: The network address as an integer
+    :param length: The prefix length
+    :param lower: The shortest route length
+    :param upper: The longest route length
+    :param max_length: 32 for IPv4, or 128 for IPv6
+    :return:
+        A ListEntry
+
+    """
+    if lower == length:
+        greater_equal = None
+        less_equal = upper if upper != length else None
+
+    else:
+        greater_equal = lower
+        less_equal = upper if upper != max_length else None
+
+    return mod.scripts.list_entry.ListEntry(action, value, length, greater_equal, less_equal, max_length=max_length)
+
+
+def merge_route_ranges(ranges, max_length):
+    """
+    Function to merge route ranges that match the same routes together, the ranges of a prefix with touching route
+    lengths are joined, and two sibling prefixes with the same route lengths become their parent prefix, the
+    longest prefixes are merged first so merged parents can merge again
+    :param ranges: A list of tuples of network value, prefix length, shortest route length, and longest route length
+    :param max_length: 32 for IPv4, or 128 for IPv6
+    :return:
+        A list of tuples of network value, prefix length, shortest route length, and longest route length, that
+        matches the same routes
+
+    """
+    prefix_ranges = dict()
+    for value, length, lower, upper in ranges:
+        prefix_ranges.setdefault((value, length), list()).append((lower, upper))
+
+    def join_lengths(prefix):
+        joined = list()
+        for lower, upper in sorted(prefix_ranges[prefix]):
+            if joined and lower <= joined[-1][1] + 1:
+                joined[-1] = (joined[-1][0], max(joined[-1][1], upper))
+
+            else:
+                joined.append((lower, upper))
+
+        prefix_ranges[prefix] = joined
+
+    length_prefixes = dict()
+    for prefix in prefix_ranges:
+        join_lengths(prefix)
+        length_prefixes.setdefault(prefix[1], set()).add(prefix[0])
+
+    for length in range(max_length, 0, -1):
+        bit = 1 << (max_length - length)
+        for value in sorted(length_prefixes.get(length, ())):
+            sibling = (value ^ bit, length)
+            if value & bit or sibling not in prefix_ranges:
+                continue
+
+            shared = set(prefix_ranges[(value, length)]) & set(prefix_ranges[sibling])
+            if not shared:
+                continue
+
+            parent = (value, length - 1)
+            for prefix in ((value, length), sibling):
+                prefix_ranges[prefix] = [lengths for lengths in prefix_ranges[prefix] if lengths not in shared]
+
+            prefix_ranges.setdefault(parent, list()).extend(shared)
+            length_prefixes.setdefault(length - 1, set()).add(value)
+            join_lengths(parent)
+
+    return [(value, length, lower, upper) for (value, length), lengths in sorted(prefix_ranges.items())
+            for lower, upper in lengths]
+
+
+def minimize_prefix_list_entries(entries):
+    """
+    Function to make a prefix-list that matches every route the same as a prefix-list, with as few entries as
+    these steps find, shadowed, and redundant entries are removed, deny entries no later permit overlaps are
+    removed, because the implicit deny does the same, and each run of entries with the same action, where the order
+    does not matter, has its route ranges merged, until nothing changes
+    :param entries: A list of ListEntry in first match order
+    :return:
+        A list of new ListEntry in first match order, without sequence numbers, an empty list if every route is
+        denied
+
+    """
+    LOGGER.debug('Starting Function minimize_prefix_list_entries')
+    entries = [entry for entry in entries if get_entry_range(entry) is not None]
+    entry_count = None
+    while entry_count != len(entries):
+        entry_count = len(entries)
+        removed = set(id(audit_record.entry) for audit_record in audit_prefix_list_entries(entries))
+        entries = [entry for entry in entries if id(entry) not in removed]
+
+        ranges = [get_entry_range(entry) for entry in entries]
+        range_index = PrefixRangeIndex(ranges)
+        kept_entries = list()
+        for index, entry in enumerate(entries):
+            if entry.action == 'deny':
+                lower, upper = ranges[index][2:4]
+                for other_index in chain(range_index.iter_holding(index), range_index.iter_inside(index)):
+                    if other_index > index and entries[other_index].action == 'permit':
+                        other_lower, other_upper = ranges[other_index][2:4]
+                        if other_lower <= upper and lower <= other_upper:
+                            kept_entries.append(entry)
+                            break
+
+            else:
+                kept_entries.append(entry)
+
+        entries = list()
+        run_start = 0
+        for index in range(1, len(kept_entries) + 1):
+            if index < len(kept_entries) and kept_entries[index].action == kept_entries[run_start].action:
+                continue
+
+            action = kept_entries[run_start].action
+            run_ranges = dict()
+            for entry in kept_entries[run_start:index]:
+                value, length, lower, upper, max_length = get_entry_range(entry)
+                run_ranges.setdefault(max_length, list()).append((value, length, lower, upper))
+
+            for max_length in sorted(run_ranges):
+                for value, length, lower, upper in merge_route_ranges(run_ranges[max_length], max_length):
+                    entries.append(get_range_entry(action, value, length, lower, upper, max_length))
+
+            run_start = index
+
+    return entries
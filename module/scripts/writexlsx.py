@@ -7,7 +7,7 @@ __copyright__ = "Copyright (c) 2017, Benjamin P. Trachtenberg"
 __credits__ = ''
 __license__ = ''
 __status__ = 'prod'
-__version_info__ = (1, 0, 5, __status__)
+__version_info__ = (1, 0, 6, __status__)
 __version__ = '.'.join(map(str, __version_info__))
 __maintainer__ = 'Benjamin P. Trachtenberg'
 __email__ = 'e_ben_75-python@yahoo.com'
@@ -191,6 +191,65 @@ class WriteXlsxTabs(Workbook):
         self.__write_data()
 
 
+class WriteXlsxStreamTabs(Workbook):
+    """
+    Class to Write the Spreadsheet one section at a time, rows are flushed to disk as they are written
+    """
+    def __init__(self, file_name):
+        LOGGER.debug('Initializing class {class_obj}'.format(class_obj=type(self)))
+        super().__init__(file_name, {'constant_memory': True})
+        self.file_name = file_name
+        self.tab_sheets = dict()
+        self.tab_rows = dict()
+        self.cell_format = self.add_format({
+            'border': 1})
+
+    def __sheet_create(self, sheet_name):
+        """
+        Method to create a sheet
+        :param sheet_name: The name of the sheet
+        :return:
+            A sheet object
+
+        """
+        LOGGER.debug('Starting method __sheet_create in class {class_obj}'.format(class_obj=type(self)))
+        sheet_obj = self.add_worksheet(sheet_name)
+        sheet_obj.hide_gridlines(2)
+        return sheet_obj
+
+    def write_section(self, tab_name, section_lines):
+        """
+        Method to add a section to the end of a tab, the tab is created the first time it is used
+        :param tab_name: The name of the tab
+        :param section_lines: A list of the lines in the section
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method write_section in class {class_obj}'.format(class_obj=type(self)))
+        if tab_name not in self.tab_sheets:
+            self.tab_sheets[tab_name] = self.__sheet_create(tab_name)
+            self.tab_rows[tab_name] = 0
+
+        sheet_obj = self.tab_sheets[tab_name]
+        row = self.tab_rows[tab_name]
+        for line in section_lines:
+            sheet_obj.write(row, 0, line, self.cell_format)
+            row += 1
+
+        self.tab_rows[tab_name] = row
+
+    def write_spreadsheet(self):
+        """
+        Method to finish the spreadsheet, and close the file
+        :return:
+            None
+
+        """
+        LOGGER.debug('Starting method write_spreadsheet in class {class_obj}'.format(class_obj=type(self)))
+        self.close()
+
+
 class WriteXlsxMultiTabDiff(Workbook):
     """
     Class to Write the Diff Spreadsheet